@@ -14,33 +14,311 @@ Features:
 - Generate document drafts from notes + template
 - Refine existing text (change tone, shorten, expand, custom instruction)
 - Sync Anthropic client for use with threading
+- Async variants (AsyncAnthropic) and generate_many() for concurrent generations
+- Streaming variants that yield text chunks as they arrive (errors as StreamError)
+- Prompt caching on the stable system prompt prefix
+- Optional on-disk response cache for identical requests (AI_WRITER_CACHE=1),
+  written atomically and pruned to RESPONSE_CACHE_MAX_ENTRIES unexpired entries
+- Optional near-duplicate notes cache for drafts (AI_WRITER_SEMANTIC_CACHE=1)
+- Bulk drafts via the Message Batches API (half price, asynchronous); failures are
+  reported apart from the texts, and permanent errors are told apart from transient ones
 
 UV ENVIRONMENT: Run with `uv run python ai_writer.py`
 
 INSTALLATION:
 uv add anthropic python-dotenv
+uv add "httpx[http2]"   # optional: HTTP/2 for the API connection
 """
 
+import asyncio
+import functools
+import hashlib
+import importlib.util
+import json
 import logging
-from anthropic import Anthropic
-
-from config import ANTHROPIC_API_KEY, CLAUDE_MODEL
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+import semantic_cache
+from config import (
+    ANTHROPIC_API_KEY, CLAUDE_MAX_RETRIES, CLAUDE_MODEL, DRAFTS_DIR,
+    RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL, SEMANTIC_CACHE_ENABLED,
+)
 from templates import DocumentTemplate
 
+if TYPE_CHECKING:
+    from anthropic import Anthropic, AsyncAnthropic
+
 logger = logging.getLogger(__name__)
 
-# Lazy-initialized sync client (avoids creating with empty key at import time)
+# Lazy-initialized clients (avoids creating with empty key at import time).
+# The SDK itself is imported on first use too — it takes ~1s to import.
 _client = None
+_async_client = None
+_client_lock = threading.Lock()  # prepare_client() may race the first request
+
+# HTTP/2 lets concurrent requests share one TLS connection; needs the optional h2 package
+_HTTP2 = importlib.util.find_spec("h2") is not None
 
 
-def _get_client() -> Anthropic:
+def _get_client() -> "Anthropic":
     """Get or create the Anthropic client."""
     global _client
     if _client is None:
-        _client = Anthropic(api_key=ANTHROPIC_API_KEY)
+        with _client_lock:
+            if _client is None:
+                from anthropic import Anthropic, DefaultHttpxClient
+                _client = Anthropic(
+                    api_key=ANTHROPIC_API_KEY,
+                    max_retries=CLAUDE_MAX_RETRIES,
+                    http_client=DefaultHttpxClient(http2=_HTTP2),
+                )
     return _client
 
 
+def prepare_client() -> None:
+    """
+    Create the shared client ahead of the first request.
+
+    Importing the SDK and building the client takes about a second; call this
+    from a background thread at startup so the first Generate click doesn't
+    pay for it. Does nothing without an API key.
+    """
+    if not ANTHROPIC_API_KEY:
+        return
+    try:
+        _get_client()
+    except Exception as e:
+        logger.warning(f"Failed to prepare Anthropic client: {e}")
+
+
+def _get_async_client() -> "AsyncAnthropic":
+    """Get or create the AsyncAnthropic client (bind to a single event loop)."""
+    global _async_client
+    if _async_client is None:
+        from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+        _async_client = AsyncAnthropic(
+            api_key=ANTHROPIC_API_KEY,
+            max_retries=CLAUDE_MAX_RETRIES,
+            http_client=DefaultAsyncHttpxClient(http2=_HTTP2),
+        )
+    return _async_client
+
+
+# Fixed instructions appended to every template prompt; part of the cached prefix
+_DRAFT_OUTPUT_RULES = "Output: finished document text only. No preamble/explanations/markdown."
+
+_REFINE_SYSTEM_PROMPT = (
+    "You are a document editor. Apply the requested change; keep structure and "
+    "meaning unless told otherwise.\n"
+    "Output: revised document text only. No preamble/explanations/markdown."
+)
+
+
+def _cached_block(text: str) -> dict:
+    """Build a system text block marked as a prompt-cache breakpoint."""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+# Built once; the SDK only reads the blocks it's given
+_REFINE_SYSTEM_BLOCK = _cached_block(_REFINE_SYSTEM_PROMPT)
+
+
+# ── Response cache ──
+
+
+def _normalize(text: str) -> str:
+    """
+    Collapse whitespace within each line so trivially different inputs share a
+    cache key. Line breaks are kept: the line structure decides headings,
+    bullets and paragraphs, so a different layout must miss the cache.
+    """
+    return "\n".join(" ".join(line.split()) for line in text.strip().splitlines())
+
+
+def _cache_key(model: str, system: list[dict], user: str) -> str:
+    """SHA-256 of the model id, system text, and user message."""
+    system_text = "\n".join(block["text"] for block in system)
+    payload = "\x00".join([model, _normalize(system_text), _normalize(user)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_lookup(key: str) -> Optional[str]:
+    """Return a cached response for key, or None if missing or expired."""
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    path = DRAFTS_DIR / ".cache" / f"{key}.json"
+    try:
+        data = json.loads(path.read_text())
+        if time.time() - data["saved_at"] > RESPONSE_CACHE_TTL:
+            path.unlink(missing_ok=True)
+            return None
+        return data["text"]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache entry {key}: {e}")
+        return None
+
+
+def _cache_update(key: str, text: str) -> None:
+    """Store a response under key (no-op when caching is disabled)."""
+    if not RESPONSE_CACHE_ENABLED:
+        return
+    try:
+        cache_dir = DRAFTS_DIR / ".cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a per-writer dotfile and rename so readers never see a partial entry
+        tmp = cache_dir / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp.write_text(json.dumps({"saved_at": time.time(), "text": text}))
+        os.replace(tmp, cache_dir / f"{key}.json")
+        _cache_prune(cache_dir)
+    except Exception as e:
+        logger.warning(f"Failed to write cache entry {key}: {e}")
+
+
+def _cache_prune(cache_dir: Path) -> None:
+    """Delete expired entries, then the oldest ones past RESPONSE_CACHE_MAX_ENTRIES."""
+    cutoff = time.time() - RESPONSE_CACHE_TTL
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for e in it:
+            if not e.name.endswith(".json"):
+                continue
+            try:
+                mtime = e.stat().st_mtime
+            except FileNotFoundError:
+                continue  # Pruned by another process
+            entries.append((mtime, e.path))
+    entries.sort(reverse=True)
+    for i, (mtime, path) in enumerate(entries):
+        if i >= RESPONSE_CACHE_MAX_ENTRIES or mtime < cutoff:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+def _message_params(system: list[dict], user_message: str) -> dict:
+    """Keyword arguments shared by sync and async Messages API calls."""
+    return {
+        "model": CLAUDE_MODEL,
+        "max_tokens": 4096,
+        "system": system,
+        "messages": [{"role": "user", "content": user_message}],
+    }
+
+
+def _create_message(system: list[dict], user_message: str) -> str:
+    """Call the Messages API, serving identical requests from the local cache."""
+    key = _cache_key(CLAUDE_MODEL, system, user_message)
+    cached = _cache_lookup(key)
+    if cached is not None:
+        logger.info("Response cache hit")
+        return cached
+
+    response = _get_client().messages.create(**_message_params(system, user_message))
+    text = response.content[0].text.strip()
+    _cache_update(key, text)
+    return text
+
+
+async def _create_message_async(system: list[dict], user_message: str) -> str:
+    """Async counterpart of _create_message using the shared AsyncAnthropic client."""
+    key = _cache_key(CLAUDE_MODEL, system, user_message)
+    if RESPONSE_CACHE_ENABLED:
+        # Cache file I/O runs in a worker thread so it never blocks the event loop
+        cached = await asyncio.to_thread(_cache_lookup, key)
+        if cached is not None:
+            logger.info("Response cache hit")
+            return cached
+
+    response = await _get_async_client().messages.create(**_message_params(system, user_message))
+    text = response.content[0].text.strip()
+    if RESPONSE_CACHE_ENABLED:
+        await asyncio.to_thread(_cache_update, key, text)
+    return text
+
+
+def _stream_message(system: list[dict], user_message: str) -> Iterator[str]:
+    """Stream a Messages API response as text chunks, caching the full text."""
+    key = _cache_key(CLAUDE_MODEL, system, user_message)
+    cached = _cache_lookup(key)
+    if cached is not None:
+        logger.info("Response cache hit")
+        yield cached
+        return
+
+    parts = []
+    with _get_client().messages.stream(**_message_params(system, user_message)) as stream:
+        for chunk in stream.text_stream:
+            parts.append(chunk)
+            yield chunk
+    _cache_update(key, "".join(parts).strip())
+
+
+class StreamError(str):
+    """
+    An error message yielded by the *_stream() functions instead of text.
+
+    It's still a str, but callers should show it apart from the document
+    (it may follow text already streamed) rather than appending it.
+    """
+
+
+# ── Request building ──
+
+
+def _check_draft_inputs(notes: str) -> Optional[str]:
+    """Return a user-facing message if a draft can't be generated, else None."""
+    if not notes.strip():
+        return "Please enter some notes or bullet points first."
+    if not ANTHROPIC_API_KEY:
+        return "Error: ANTHROPIC_API_KEY not set. Please add it to your .env file."
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _template_block(template: DocumentTemplate) -> dict:
+    """The cached system block for a template, built once per template (templates are frozen)."""
+    return _cached_block(f"{template.system_prompt}\n\n{_DRAFT_OUTPUT_RULES}")
+
+
+def _draft_request(template: DocumentTemplate, notes: str, tone: str) -> tuple[list[dict], str]:
+    """Build the (system blocks, user message) pair for a draft."""
+    # Stable prefix first (cached server-side per template), variable tone last
+    system_blocks = [
+        _template_block(template),
+        {"type": "text", "text": f"Tone: {tone}"},
+    ]
+    user_message = f"Type: {template.display_name}\nNotes:\n{notes}"
+    return system_blocks, user_message
+
+
+def _check_refine_inputs(current_text: str, instruction: str) -> Optional[str]:
+    """Return the text to hand back without calling the API, else None."""
+    if not current_text.strip():
+        return "No text to refine. Generate a draft first."
+    if not instruction.strip():
+        return current_text
+    if not ANTHROPIC_API_KEY:
+        return "Error: ANTHROPIC_API_KEY not set. Please add it to your .env file."
+    return None
+
+
+def _refine_request(current_text: str, instruction: str) -> tuple[list[dict], str]:
+    """Build the (system blocks, user message) pair for a refinement."""
+    user_message = f"Document:\n{current_text}\n\nChange: {instruction}"
+    return [_REFINE_SYSTEM_BLOCK], user_message
+
+
+# ── Public API ──
+
+
 def generate_draft(
     template: DocumentTemplate,
     notes: str,
@@ -57,38 +335,114 @@ def generate_draft(
     Returns:
         Generated document text (plain text, no markdown)
     """
-    if not notes.strip():
-        return "Please enter some notes or bullet points first."
+    early = _check_draft_inputs(notes)
+    if early is not None:
+        return early
 
-    if not ANTHROPIC_API_KEY:
-        return "Error: ANTHROPIC_API_KEY not set. Please add it to your .env file."
+    system_blocks, user_message = _draft_request(template, notes, tone)
 
-    system_prompt = (
-        f"{template.system_prompt}\n\n"
-        f"Tone: {tone}\n"
-        f"Important: Output ONLY the document text. No preamble, no explanations, "
-        f"no markdown. Just the finished document ready to read or print."
-    )
+    bucket = semantic_cache.bucket_key(CLAUDE_MODEL, template.system_prompt, tone)
+    if SEMANTIC_CACHE_ENABLED:
+        cached = semantic_cache.lookup(bucket, notes)
+        if cached is not None:
+            return cached
 
-    user_message = (
-        f"Document type: {template.display_name}\n\n"
-        f"My notes and bullet points:\n{notes}"
-    )
+    try:
+        text = _create_message(system_blocks, user_message)
+        if SEMANTIC_CACHE_ENABLED:
+            semantic_cache.update(bucket, notes, text)
+        return text
+
+    except Exception as e:
+        logger.error(f"Failed to generate draft: {e}")
+        return f"Error generating draft: {e}"
+
+
+def generate_draft_stream(
+    template: DocumentTemplate,
+    notes: str,
+    tone: str = "Professional",
+) -> Iterator[str]:
+    """
+    Streaming version of generate_draft(): yields text chunks as they arrive.
+
+    Validation and error messages are yielded as a single StreamError chunk,
+    matching the strings generate_draft() would return.
+    """
+    early = _check_draft_inputs(notes)
+    if early is not None:
+        yield StreamError(early)
+        return
 
+    system_blocks, user_message = _draft_request(template, notes, tone)
+
+    bucket = semantic_cache.bucket_key(CLAUDE_MODEL, template.system_prompt, tone)
+    if SEMANTIC_CACHE_ENABLED:
+        cached = semantic_cache.lookup(bucket, notes)
+        if cached is not None:
+            yield cached
+            return
+
+    parts = []
     try:
-        response = _get_client().messages.create(
-            model=CLAUDE_MODEL,
-            max_tokens=4096,
-            system=system_prompt,
-            messages=[{"role": "user", "content": user_message}],
-        )
-        return response.content[0].text.strip()
+        for chunk in _stream_message(system_blocks, user_message):
+            parts.append(chunk)
+            yield chunk
+    except Exception as e:
+        logger.error(f"Failed to generate draft: {e}")
+        yield StreamError(f"Error generating draft: {e}")
+        return
+
+    if SEMANTIC_CACHE_ENABLED:
+        semantic_cache.update(bucket, notes, "".join(parts).strip())
+
+
+async def generate_draft_async(
+    template: DocumentTemplate,
+    notes: str,
+    tone: str = "Professional",
+) -> str:
+    """Async version of generate_draft() for use from an event loop."""
+    early = _check_draft_inputs(notes)
+    if early is not None:
+        return early
+
+    system_blocks, user_message = _draft_request(template, notes, tone)
+
+    bucket = semantic_cache.bucket_key(CLAUDE_MODEL, template.system_prompt, tone)
+    if SEMANTIC_CACHE_ENABLED:
+        cached = await asyncio.to_thread(semantic_cache.lookup, bucket, notes)
+        if cached is not None:
+            return cached
+
+    try:
+        text = await _create_message_async(system_blocks, user_message)
+        if SEMANTIC_CACHE_ENABLED:
+            await asyncio.to_thread(semantic_cache.update, bucket, notes, text)
+        return text
 
     except Exception as e:
         logger.error(f"Failed to generate draft: {e}")
         return f"Error generating draft: {e}"
 
 
+async def generate_many(
+    requests: list[tuple[DocumentTemplate, str, str]],
+) -> list[str]:
+    """
+    Generate several drafts concurrently.
+
+    Args:
+        requests: (template, notes, tone) tuples
+
+    Returns:
+        Generated texts in the same order as requests
+    """
+    return await asyncio.gather(
+        *(generate_draft_async(template, notes, tone) for template, notes, tone in requests)
+    )
+
+
 def refine_text(
     current_text: str,
     instruction: str,
@@ -105,41 +459,139 @@ def refine_text(
     Returns:
         Refined document text
     """
-    if not current_text.strip():
-        return "No text to refine. Generate a draft first."
+    early = _check_refine_inputs(current_text, instruction)
+    if early is not None:
+        return early
 
-    if not instruction.strip():
-        return current_text
+    try:
+        return _create_message(*_refine_request(current_text, instruction))
 
-    if not ANTHROPIC_API_KEY:
-        return "Error: ANTHROPIC_API_KEY not set. Please add it to your .env file."
+    except Exception as e:
+        logger.error(f"Failed to refine text: {e}")
+        return f"Error refining text: {e}"
 
-    system_prompt = (
-        "You are a document editor. The user has a document and wants changes made. "
-        "Apply the requested changes while preserving the document's overall structure "
-        "and meaning unless told otherwise. "
-        "Output ONLY the revised document text. No preamble, no explanations, no markdown."
-    )
 
-    user_message = (
-        f"Here is the current document:\n\n{current_text}\n\n"
-        f"Please make this change: {instruction}"
-    )
+def refine_text_stream(
+    current_text: str,
+    instruction: str,
+    template_name: str = "general",
+) -> Iterator[str]:
+    """Streaming version of refine_text(): yields text chunks as they arrive, or a StreamError."""
+    early = _check_refine_inputs(current_text, instruction)
+    if early is not None:
+        yield early if early is current_text else StreamError(early)
+        return
 
     try:
-        response = _get_client().messages.create(
-            model=CLAUDE_MODEL,
-            max_tokens=4096,
-            system=system_prompt,
-            messages=[{"role": "user", "content": user_message}],
-        )
-        return response.content[0].text.strip()
+        yield from _stream_message(*_refine_request(current_text, instruction))
+    except Exception as e:
+        logger.error(f"Failed to refine text: {e}")
+        yield StreamError(f"Error refining text: {e}")
+
+
+async def refine_text_async(
+    current_text: str,
+    instruction: str,
+    template_name: str = "general",
+) -> str:
+    """Async version of refine_text() for use from an event loop."""
+    early = _check_refine_inputs(current_text, instruction)
+    if early is not None:
+        return early
+
+    try:
+        return await _create_message_async(*_refine_request(current_text, instruction))
 
     except Exception as e:
         logger.error(f"Failed to refine text: {e}")
         return f"Error refining text: {e}"
 
 
+# ── Message Batches (bulk, non-interactive) ──
+
+
+def submit_draft_batch(
+    requests: dict[str, tuple[DocumentTemplate, str, str]],
+) -> Optional[str]:
+    """
+    Submit several drafts as one Message Batch (billed at half price).
+
+    Results arrive asynchronously, usually within an hour; poll them with
+    get_batch_results(). Requests with empty notes are skipped.
+
+    Args:
+        requests: custom_id -> (template, notes, tone). IDs must be 1-64
+            characters of letters, digits, '_' or '-'.
+
+    Returns:
+        Batch ID, or None on error or if nothing was submitted
+    """
+    if not ANTHROPIC_API_KEY:
+        logger.error("ANTHROPIC_API_KEY not set; cannot submit batch")
+        return None
+
+    batch_requests = [
+        {"custom_id": custom_id, "params": _message_params(*_draft_request(template, notes, tone))}
+        for custom_id, (template, notes, tone) in requests.items()
+        if _check_draft_inputs(notes) is None
+    ]
+    if not batch_requests:
+        return None
+
+    try:
+        batch = _get_client().messages.batches.create(requests=batch_requests)
+        logger.info(f"Submitted batch {batch.id} ({len(batch_requests)} drafts)")
+        return batch.id
+    except Exception as e:
+        logger.error(f"Failed to submit batch: {e}")
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class BatchResults:
+    """What get_batch_results() found for a batch."""
+    status: str  # "processing", "ended", "unavailable" (try again later) or "failed" (give up)
+    texts: dict[str, str] = field(default_factory=dict)  # custom_id -> generated text
+    errors: dict[str, str] = field(default_factory=dict)  # custom_id -> why it produced no text
+    error: str = ""  # Why the batch itself couldn't be checked
+
+
+def _is_permanent_error(e: Exception) -> bool:
+    """Whether retrying an API call can't help (bad, expired or unauthorized batch ID)."""
+    status_code = getattr(e, "status_code", None)
+    return isinstance(status_code, int) and 400 <= status_code < 500 and status_code not in (408, 409, 429)
+
+
+def get_batch_results(batch_id: str) -> BatchResults:
+    """
+    Fetch the results of a batch submitted with submit_draft_batch().
+
+    Returns:
+        BatchResults with status "ended" and texts/errors once the batch has
+        finished, "processing" until then, "unavailable" if it couldn't be
+        checked right now, or "failed" if it never can be (unknown, expired or
+        unauthorized batch ID)
+    """
+    try:
+        client = _get_client()
+        batch = client.messages.batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return BatchResults("processing")
+
+        texts, errors = {}, {}
+        for entry in client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                texts[entry.custom_id] = entry.result.message.content[0].text.strip()
+            else:
+                errors[entry.custom_id] = f"request {entry.result.type}"
+        return BatchResults("ended", texts, errors)
+
+    except Exception as e:
+        logger.error(f"Failed to check batch {batch_id}: {e}")
+        status = "failed" if _is_permanent_error(e) else "unavailable"
+        return BatchResults(status, error=str(e))
+
+
 if __name__ == "__main__":
     # Quick test
     from templates import TEMPLATES
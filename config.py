@@ -31,12 +31,39 @@ load_dotenv(Path(__file__).parent / ".env")
 # API Configuration
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-20250514")
+CLAUDE_MAX_RETRIES = int(os.getenv("CLAUDE_MAX_RETRIES", "3"))
+
+# Local response cache (opt-in) — identical requests skip the API round trip
+RESPONSE_CACHE_ENABLED = os.getenv("AI_WRITER_CACHE", "") == "1"
+RESPONSE_CACHE_TTL = int(os.getenv("AI_WRITER_CACHE_TTL", str(7 * 24 * 3600)))  # 7 days default
+RESPONSE_CACHE_MAX_ENTRIES = 500
+
+# Near-duplicate notes cache (opt-in) — reuses a draft when notes barely changed
+SEMANTIC_CACHE_ENABLED = os.getenv("AI_WRITER_SEMANTIC_CACHE", "") == "1"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("AI_WRITER_SEMANTIC_THRESHOLD", "0.93"))
+SEMANTIC_CACHE_MAX_ENTRIES = 500
+
+# Write-behind draft saves (opt-in) — save_draft returns before the file is written
+DRAFT_WRITE_BEHIND = os.getenv("AI_WRITER_WRITE_BEHIND", "") == "1"
 
 # Web App Configuration
 WEB_PORT = int(os.getenv("WEB_PORT", "8090"))
 WEB_PASSWORD = os.getenv("WEB_PASSWORD", "")
 WEB_SECRET_KEY = os.getenv("WEB_SECRET_KEY", "change-me-in-production")
 WEB_SESSION_TIMEOUT = int(os.getenv("WEB_SESSION_TIMEOUT", "1800"))  # 30 min default
+WEB_THREAD_LIMIT = int(os.getenv("WEB_THREAD_LIMIT", "32"))  # concurrent blocking calls (disk, exports)
+WEB_EXPORT_MAX_AGE = int(os.getenv("WEB_EXPORT_MAX_AGE", "3600"))  # seconds an undownloaded export is kept
+# Rate limit counters: memory:// is per process; redis://host:6379/0 shares them
+# across workers and hosts (needs `uv add redis`)
+WEB_RATELIMIT_STORAGE = os.getenv("WEB_RATELIMIT_STORAGE", "memory://")
+# Proxies whose X-Forwarded-For is believed (comma-separated IPs/CIDRs); the
+# default suits Cloudflare Tunnel, where cloudflared connects from localhost
+WEB_TRUSTED_PROXIES = os.getenv("WEB_TRUSTED_PROXIES", "127.0.0.1,::1")
+# uvicorn worker processes; defaults to one per CPU once rate limits are shared
+WEB_WORKERS = int(
+    os.getenv("WEB_CONCURRENCY")
+    or (1 if WEB_RATELIMIT_STORAGE.startswith("memory://") else os.cpu_count() or 1)
+)
 
 # Paths
 DRAFTS_DIR = Path.home() / "Documents" / "AI Writer Drafts"
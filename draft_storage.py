@@ -13,26 +13,59 @@ Enhancement: Initial implementation
 Features:
 - Save drafts as JSON to ~/Documents/AI Writer Drafts/
 - Load drafts back into the editor
-- List available drafts
+- List available drafts (metadata served from a single index file)
+- list_drafts() result reused until the drafts folder changes (one stat per call)
+- Optional write-behind saves via a background writer thread (AI_WRITER_WRITE_BEHIND=1)
+- Pending Message Batch IDs recorded beside the index, so results survive a restart
 
 UV ENVIRONMENT: Run with `uv run python draft_storage.py`
 
 INSTALLATION:
-uv add pydantic
+uv add pydantic orjson
 """
 
-import json
+import atexit
 import logging
+import os
+import queue
+import re
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import orjson
 from pydantic import BaseModel
 
-from config import DRAFTS_DIR
+from config import DRAFT_WRITE_BEHIND, DRAFTS_DIR
 
 logger = logging.getLogger(__name__)
 
+# Metadata index so list_drafts() doesn't have to open every draft file
+INDEX_FILENAME = ".index.json"
+_index_lock = threading.Lock()
+
+# Submitted batches whose results haven't been saved as drafts yet
+PENDING_BATCHES_FILENAME = ".batches.json"
+_batches_lock = threading.Lock()
+
+# Characters dropped from titles when building filenames; \w is exactly
+# str.isalnum() plus '_', so this keeps alphanumerics, space, '-' and '_'
+_TITLE_STRIP_RE = re.compile(r'[^\w -]')
+
+# Write-behind state: path -> (bytes, summary) not yet on disk. Re-saving a
+# pending path replaces its bytes instead of queueing a second write, and
+# readers consult this map first so they always see the latest save.
+_pending: dict[Path, tuple[bytes, dict]] = {}
+_pending_lock = threading.Lock()
+_write_queue: "queue.Queue[Path]" = queue.Queue()
+_writer: Optional[threading.Thread] = None
+
+# Last list_drafts() result: (drafts dir, dir st_mtime_ns, drafts). Adding,
+# removing or renaming a file (including the index rewrite) bumps the mtime;
+# saves and deletes also drop it explicitly in case the mtime is too coarse.
+_list_cache: Optional[tuple[Path, int, list[dict]]] = None
+
 
 class Draft(BaseModel):
     """A saved document draft."""
@@ -60,9 +93,14 @@ def save_draft(
     """
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        clean_title = "".join(c if c.isalnum() or c in " -_" else "" for c in title)[:40]
+        clean_title = _TITLE_STRIP_RE.sub('', title)[:40]
         clean_title = clean_title.strip().replace(" ", "_") or "untitled"
         filename = f"{clean_title}_{timestamp}.json"
+        # Same title within the same second (e.g. batch results): add a counter
+        n = 1
+        while _draft_exists(DRAFTS_DIR / filename):
+            filename = f"{clean_title}_{timestamp}_{n}.json"
+            n += 1
 
         draft = Draft(
             title=title,
@@ -75,8 +113,12 @@ def save_draft(
         )
 
         filepath = DRAFTS_DIR / filename
-        filepath.write_text(draft.model_dump_json(indent=2))
-        logger.info(f"Draft saved: {filepath}")
+        data = draft.model_dump()
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        if DRAFT_WRITE_BEHIND:
+            _enqueue_write(filepath, content, _summary(data))
+        else:
+            _write_draft(filepath, content, _summary(data))
         return str(filepath)
 
     except Exception as e:
@@ -84,15 +126,26 @@ def save_draft(
         return None
 
 
+def _draft_exists(path: Path) -> bool:
+    """Whether path is on disk or waiting for the background writer."""
+    with _pending_lock:
+        if path in _pending:
+            return True
+    return path.exists()
+
+
 def load_draft(filepath: str) -> Optional[Draft]:
     """Load a draft from a JSON file."""
     try:
         path = Path(filepath)
+        with _pending_lock:
+            pending = _pending.get(path)
+        if pending is not None:
+            return Draft(**orjson.loads(pending[0]))
         if not path.exists():
             logger.error(f"Draft not found: {filepath}")
             return None
-        data = json.loads(path.read_text())
-        return Draft(**data)
+        return Draft(**orjson.loads(path.read_bytes()))
     except Exception as e:
         logger.error(f"Failed to load draft: {e}")
         return None
@@ -110,6 +163,9 @@ def delete_draft(filename: str) -> bool:
     """
     try:
         safe_name = Path(filename).name
+        if safe_name.startswith("."):
+            logger.warning(f"Refusing to delete app metadata file: {filename}")
+            return False
         filepath = (DRAFTS_DIR / safe_name).resolve()
         if not str(filepath).startswith(str(DRAFTS_DIR.resolve())):
             logger.warning(f"Path traversal attempt blocked: {filename}")
@@ -118,6 +174,7 @@ def delete_draft(filename: str) -> bool:
             logger.error(f"Draft not found or not JSON: {safe_name}")
             return False
         filepath.unlink()
+        _invalidate_list_cache()
         logger.info(f"Draft deleted: {filepath}")
         return True
     except Exception as e:
@@ -125,27 +182,237 @@ def delete_draft(filename: str) -> bool:
         return False
 
 
+def _write_draft(filepath: Path, content: bytes, summary: dict) -> None:
+    """Write a draft file and record it in the index."""
+    filepath.write_bytes(content)
+    logger.info(f"Draft saved: {filepath}")
+    with _index_lock:
+        index = _read_index()
+        index[filepath.name] = summary
+        _write_index(index)
+    _invalidate_list_cache()
+
+
+def _writer_loop() -> None:
+    """Background writer: drains _write_queue, writing the latest bytes for each path."""
+    while True:
+        path = _write_queue.get()
+        content = None
+        try:
+            with _pending_lock:
+                content, summary = _pending[path]
+            # Write to a dotfile and rename so readers never see a partial draft
+            tmp = path.with_name(f".{path.name}.tmp")
+            tmp.write_bytes(content)
+            os.replace(tmp, path)
+            with _pending_lock:
+                # A re-save while writing replaced the entry; leave it queued
+                if _pending.get(path, (None,))[0] is content:
+                    del _pending[path]
+                    requeue = False
+                else:
+                    requeue = True
+            if requeue:
+                _write_queue.put(path)
+            else:
+                logger.info(f"Draft saved: {path}")
+                with _index_lock:
+                    index = _read_index()
+                    index[path.name] = summary
+                    _write_index(index)
+                _invalidate_list_cache()
+        except Exception as e:
+            with _pending_lock:
+                entry = _pending.get(path)
+                if entry is not None and entry[0] is content:
+                    # Drop it so readers don't see a draft that isn't on disk
+                    del _pending[path]
+                    requeue = False
+                else:
+                    # A re-save while writing replaced the entry; try again with that
+                    requeue = entry is not None
+            if requeue:
+                logger.warning(f"Failed to save draft {path}, retrying with newer save: {e}")
+                _write_queue.put(path)
+            else:
+                logger.error(f"Failed to save draft {path}: {e}")
+        finally:
+            _write_queue.task_done()
+
+
+def _enqueue_write(filepath: Path, content: bytes, summary: dict) -> None:
+    """Hand a draft to the background writer, coalescing with a pending write of the same path."""
+    global _writer
+    with _pending_lock:
+        queued = filepath in _pending
+        _pending[filepath] = (content, summary)
+        if _writer is None:
+            _writer = threading.Thread(target=_writer_loop, name="draft-writer", daemon=True)
+            _writer.start()
+            atexit.register(flush_drafts)
+    if not queued:
+        _write_queue.put(filepath)
+
+
+def flush_drafts() -> None:
+    """Block until every queued draft write has reached disk."""
+    if _writer is not None:
+        _write_queue.join()
+
+
+def _summary(data: dict) -> dict:
+    """Extract the fields list_drafts() needs from a draft's JSON data."""
+    return {
+        "title": data.get("title", "Untitled"),
+        "saved_at": data.get("saved_at", ""),
+        "template_name": data.get("template_name", "general"),
+    }
+
+
+def _read_index() -> dict:
+    """Load the index (filename -> summary, or None for unreadable files)."""
+    try:
+        data = orjson.loads((DRAFTS_DIR / INDEX_FILENAME).read_bytes())
+        return data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Rebuilding unreadable draft index: {e}")
+        return {}
+
+
+def _write_index(index: dict) -> None:
+    """Atomically replace the index file."""
+    path = DRAFTS_DIR / INDEX_FILENAME
+    tmp = path.with_name(f"{INDEX_FILENAME}.tmp")
+    try:
+        tmp.write_bytes(orjson.dumps(index))
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning(f"Failed to write draft index: {e}")
+
+
+def load_pending_batches() -> dict[str, dict[str, dict]]:
+    """Batches still awaiting results: batch ID -> custom_id -> draft fields."""
+    try:
+        data = orjson.loads((DRAFTS_DIR / PENDING_BATCHES_FILENAME).read_bytes())
+        return data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable pending batch list: {e}")
+        return {}
+
+
+def add_pending_batch(batch_id: str, drafts: dict[str, dict]) -> None:
+    """Record a submitted batch so its results can be collected after a restart."""
+    with _batches_lock:
+        batches = load_pending_batches()
+        batches[batch_id] = drafts
+        _write_pending_batches(batches)
+
+
+def remove_pending_batch(batch_id: str) -> None:
+    """Forget a batch once its results are saved or it can no longer be fetched."""
+    with _batches_lock:
+        batches = load_pending_batches()
+        if batches.pop(batch_id, None) is not None:
+            _write_pending_batches(batches)
+
+
+def _write_pending_batches(batches: dict) -> None:
+    """Atomically replace the pending batch list."""
+    path = DRAFTS_DIR / PENDING_BATCHES_FILENAME
+    tmp = path.with_name(f"{PENDING_BATCHES_FILENAME}.tmp")
+    try:
+        DRAFTS_DIR.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(orjson.dumps(batches))
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.error(f"Failed to record pending batches: {e}")
+
+
+def _invalidate_list_cache() -> None:
+    """Force the next list_drafts() call to re-read the index."""
+    global _list_cache
+    _list_cache = None
+
+
+def _list_draft_filenames() -> list[str]:
+    """Draft filenames in DRAFTS_DIR, newest first (one readdir, no per-file stat).
+
+    Dotfiles are app metadata (the index, caches), never drafts.
+    """
+    with os.scandir(DRAFTS_DIR) as entries:
+        names = [
+            e.name for e in entries
+            if e.name.endswith(".json") and not e.name.startswith(".") and e.is_file()
+        ]
+    names.sort(reverse=True)
+    return names
+
+
 def list_drafts() -> list[dict]:
     """
     List all saved drafts, newest first.
 
+    Metadata comes from the index file; the directory listing is used only to
+    reconcile it, so files added or removed outside the app are picked up and
+    just those files are read. While the drafts folder is unchanged the
+    previous result is returned without touching either.
+
     Returns:
         List of dicts with 'title', 'saved_at', 'filepath', 'template_name'
     """
+    global _list_cache
     drafts = []
     try:
-        for f in sorted(DRAFTS_DIR.glob("*.json"), reverse=True):
-            try:
-                data = json.loads(f.read_text())
-                drafts.append({
-                    "title": data.get("title", "Untitled"),
-                    "saved_at": data.get("saved_at", ""),
-                    "filepath": str(f),
-                    "template_name": data.get("template_name", "general"),
-                    "filename": f.name,
-                })
-            except Exception:
+        with _pending_lock:
+            pending = {
+                path.name: summary
+                for path, (_, summary) in _pending.items()
+                if path.parent == DRAFTS_DIR
+            }
+        mtime = os.stat(DRAFTS_DIR).st_mtime_ns
+        cached = _list_cache
+        if not pending and cached is not None and cached[:2] == (DRAFTS_DIR, mtime):
+            return list(cached[2])
+
+        with _index_lock:
+            index = _read_index()
+            names = _list_draft_filenames()
+            if pending:
+                names = sorted(set(names).union(pending), reverse=True)
+            current = {}
+            for name in names:
+                if name in pending:
+                    current[name] = pending[name]
+                    continue
+                if name in index:
+                    current[name] = index[name]
+                    continue
+                try:
+                    current[name] = _summary(orjson.loads((DRAFTS_DIR / name).read_bytes()))
+                except Exception:
+                    current[name] = None  # Remember unreadable files so they aren't re-read
+            if current.keys() != index.keys():
+                _write_index(current)
+                mtime = os.stat(DRAFTS_DIR).st_mtime_ns  # The index rewrite touched the folder
+
+        for name in names:
+            summary = current[name]
+            if summary is None:
                 continue
+            drafts.append({
+                **summary,
+                "filepath": str(DRAFTS_DIR / name),
+                "filename": name,
+            })
+        # Filenames start with the title, so order by the save time instead
+        drafts.sort(key=lambda d: d["saved_at"] or "", reverse=True)
+        if not pending:
+            _list_cache = (DRAFTS_DIR, mtime, drafts)
+            return list(drafts)
     except Exception as e:
         logger.error(f"Failed to list drafts: {e}")
     return drafts
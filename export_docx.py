@@ -13,6 +13,7 @@ Enhancement: Initial implementation
 Features:
 - Convert plain text documents to Word (.docx) format
 - Auto-detect headings, bullets, numbered lists
+- render_docx() returns the document bytes without writing a file
 - Professional formatting
 
 UV ENVIRONMENT: Run with `uv run python export_docx.py`
@@ -21,25 +22,107 @@ INSTALLATION:
 uv add python-docx
 """
 
+import io
 import re
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from docx import Document
-from docx.shared import Pt, Inches, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-
 from config import DRAFTS_DIR
+from text_structure import BULLET, HEADING, NUMBERED, NUMBERED_RE, SUBHEADING, classify_line
 
 logger = logging.getLogger(__name__)
 
+_CLEAN_NAME_RE = re.compile(r'[^\w\s-]')
+
+
+def render_docx(text: str, title: str = "Document") -> bytes:
+    """
+    Render a plain text document to Word (.docx) bytes (no file is written).
+
+    Raises on rendering errors; export_to_docx() is the error-handling wrapper.
+    """
+    # Deferred so importing this module doesn't load python-docx
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt, RGBColor
+
+    doc = Document()
+
+    # Set default font
+    style = doc.styles['Normal']
+    font = style.font
+    font.name = 'Calibri'
+    font.size = Pt(11)
+
+    # Add title
+    title_para = doc.add_heading(title, level=0)
+    title_para.alignment = WD_ALIGN_PARAGRAPH.LEFT
+
+    # Add date
+    date_para = doc.add_paragraph(datetime.now().strftime("%B %d, %Y"))
+    date_para.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    for run in date_para.runs:
+        run.font.color.rgb = RGBColor(128, 128, 128)
+        run.font.size = Pt(10)
+
+    doc.add_paragraph("")  # Spacer
+
+    # Resolve style IDs once. Assigning styles by name makes python-docx
+    # scan every style in the document per paragraph, which dominated
+    # export time for long documents.
+    style_ids = {
+        name: doc.styles[name].style_id
+        for name in ('Heading 1', 'Heading 2', 'List Bullet', 'List Number')
+    }
+
+    def add_styled(text: str, style_name: str):
+        para = doc.add_paragraph(text)
+        para._p.style = style_ids[style_name]
+
+    # Process text line by line
+    lines = text.split('\n')
+    for line in lines:
+        stripped = line.strip()
+
+        if not stripped:
+            doc.add_paragraph("")
+            continue
+
+        kind = classify_line(stripped)
+
+        # ALL CAPS = section heading
+        if kind == HEADING:
+            add_styled(stripped.title(), 'Heading 1')
+
+        # Lines ending with colon = sub-heading
+        elif kind == SUBHEADING:
+            add_styled(stripped, 'Heading 2')
+
+        # Bullet points
+        elif kind == BULLET:
+            add_styled(stripped[2:], 'List Bullet')
+
+        # Numbered items
+        elif kind == NUMBERED:
+            add_styled(stripped[NUMBERED_RE.match(stripped).end():], 'List Number')
+
+        # Regular paragraph
+        else:
+            doc.add_paragraph(stripped)
+
+    # Build the ZIP in memory; the caller decides where the bytes go
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
 
 def export_to_docx(
     text: str,
     title: str = "Document",
     output_path: Optional[str] = None,
+    output_dir: Optional[Path] = None,
 ) -> Optional[str]:
     """
     Export plain text document to Word (.docx) format.
@@ -47,77 +130,33 @@ def export_to_docx(
     Args:
         text: The document text to export
         title: Title for the document header
-        output_path: Where to save. If None, saves to drafts directory.
+        output_path: Where to save. If None, saves to output_dir.
+        output_dir: Folder for the generated filename (default: drafts directory)
 
     Returns:
         Path to saved DOCX, or None on error
     """
-    if not text.strip():
+    if not text or text.isspace():
         logger.error("No text to export")
         return None
 
     try:
-        doc = Document()
-
-        # Set default font
-        style = doc.styles['Normal']
-        font = style.font
-        font.name = 'Calibri'
-        font.size = Pt(11)
-
-        # Add title
-        title_para = doc.add_heading(title, level=0)
-        title_para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-
-        # Add date
-        date_para = doc.add_paragraph(datetime.now().strftime("%B %d, %Y"))
-        date_para.alignment = WD_ALIGN_PARAGRAPH.LEFT
-        for run in date_para.runs:
-            run.font.color.rgb = RGBColor(128, 128, 128)
-            run.font.size = Pt(10)
-
-        doc.add_paragraph("")  # Spacer
-
-        # Process text line by line
-        lines = text.split('\n')
-        for line in lines:
-            stripped = line.strip()
-
-            if not stripped:
-                doc.add_paragraph("")
-                continue
-
-            # ALL CAPS = section heading
-            if stripped.isupper() and len(stripped) > 3 and len(stripped) < 80:
-                doc.add_heading(stripped.title(), level=1)
-
-            # Lines ending with colon = sub-heading
-            elif stripped.endswith(':') and len(stripped) < 60:
-                doc.add_heading(stripped, level=2)
-
-            # Bullet points
-            elif stripped.startswith('- ') or stripped.startswith('* '):
-                doc.add_paragraph(stripped[2:], style='List Bullet')
-
-            # Numbered items
-            elif re.match(r'^\d+[\.\)]\s', stripped):
-                clean = re.sub(r'^\d+[\.\)]\s', '', stripped)
-                doc.add_paragraph(clean, style='List Number')
-
-            # Regular paragraph
-            else:
-                doc.add_paragraph(stripped)
+        data = render_docx(text, title)
 
         # Determine output path
         if output_path is None:
-            clean_name = re.sub(r'[^\w\s-]', '', title)[:30].replace(' ', '_')
+            clean_name = _CLEAN_NAME_RE.sub('', title)[:30].replace(' ', '_')
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{clean_name}_{timestamp}.docx"
-            output_path = str(DRAFTS_DIR / filename)
-
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-
-        doc.save(output_path)
+            output_path = str((output_dir or DRAFTS_DIR) / filename)
+
+        path = Path(output_path)
+        try:
+            path.write_bytes(data)
+        except FileNotFoundError:
+            # Parent missing (custom path, or drafts dir removed) — create and retry
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
         logger.info(f"DOCX exported: {output_path}")
         return output_path
 
@@ -14,6 +14,7 @@ Features:
 - Convert plain text documents to PDF
 - Unicode font support
 - Clean document formatting with title and date
+- render_pdf() returns the document bytes without writing a file
 
 UV ENVIRONMENT: Run with `uv run python export_pdf.py`
 
@@ -25,15 +26,17 @@ import os
 import re
 import logging
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-from fpdf import FPDF
-
 from config import DRAFTS_DIR
+from text_structure import BULLET, HEADING, NUMBERED, SUBHEADING, classify_line
 
 logger = logging.getLogger(__name__)
 
+_CLEAN_NAME_RE = re.compile(r'[^\w\s-]')
+
 
 def _find_font_variant(base_path: str, variant: str) -> Optional[str]:
     """Find a bold or italic variant of a font file.
@@ -68,6 +71,7 @@ def _find_font_variant(base_path: str, variant: str) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=1)
 def _get_unicode_font_path() -> Optional[str]:
     """Find a Unicode-capable TTF font on the system."""
     candidates = [
@@ -82,51 +86,153 @@ def _get_unicode_font_path() -> Optional[str]:
     return None
 
 
-class DocumentPDF(FPDF):
-    """Custom PDF for document export with header/footer."""
-
-    def __init__(self, title: str = "Document"):
-        super().__init__()
-        self.doc_title = title
-        self.set_auto_page_break(auto=True, margin=20)
-        self._setup_fonts()
-
-    def _setup_fonts(self):
-        """Register Unicode font if available."""
-        font_path = _get_unicode_font_path()
-        if font_path:
-            self.add_font("UniSans", "", font_path, uni=True)
-            bold_path = _find_font_variant(font_path, "Bold")
-            self.add_font("UniSans", "B", bold_path if bold_path else font_path, uni=True)
-            italic_path = _find_font_variant(font_path, "Oblique") or _find_font_variant(font_path, "Italic")
-            self.add_font("UniSans", "I", italic_path if italic_path else font_path, uni=True)
-            self._font_family = "UniSans"
-        else:
-            self._font_family = "Helvetica"
+@lru_cache(maxsize=1)
+def _get_font_files() -> Optional[tuple[str, str, str]]:
+    """Resolve (regular, bold, italic) font paths once per process.
+
+    Missing variants fall back to the regular font. Returns None if no
+    Unicode font is installed.
+    """
+    font_path = _get_unicode_font_path()
+    if not font_path:
+        return None
+    bold_path = _find_font_variant(font_path, "Bold") or font_path
+    italic_path = (
+        _find_font_variant(font_path, "Oblique")
+        or _find_font_variant(font_path, "Italic")
+        or font_path
+    )
+    return font_path, bold_path, italic_path
+
+
+@lru_cache(maxsize=1)
+def _document_pdf_class():
+    """Define DocumentPDF on first use so importing this module doesn't load fpdf2."""
+    from fpdf import FPDF
+
+    class DocumentPDF(FPDF):
+        """Custom PDF for document export with header/footer."""
+
+        def __init__(self, title: str = "Document"):
+            super().__init__()
+            self.doc_title = title
+            # One date for every page header, even if rendering crosses midnight
+            self.date_str = datetime.now().strftime("%B %d, %Y")
+            self.set_auto_page_break(auto=True, margin=20)
+            self._setup_fonts()
+
+        def _setup_fonts(self):
+            """Register Unicode font if available.
+
+            fpdf2 parses the TTF on every add_font(), and subsets the parsed font in
+            place at output(), so parsed fonts can't be shared between instances.
+            Instead, a bold/italic style whose file is just the regular font is not
+            registered again; set_font() renders it with the regular face, which
+            is what the duplicate registration produced anyway.
+            """
+            self._aliased_styles = set()
+            font_files = _get_font_files()
+            if font_files:
+                font_path, bold_path, italic_path = font_files
+                self.add_font("UniSans", "", font_path)
+                for style, path in (("B", bold_path), ("I", italic_path)):
+                    if path == font_path:
+                        self._aliased_styles.add(style)
+                    else:
+                        self.add_font("UniSans", style, path)
+                self._font_family = "UniSans"
+            else:
+                self._font_family = "Helvetica"
+
+        def set_font(self, family=None, style="", size=0):
+            if style in self._aliased_styles and family == self._font_family:
+                style = ""
+            super().set_font(family, style, size)
+
+        @property
+        def font_name(self):
+            return self._font_family
+
+        def header(self):
+            self.set_font(self.font_name, "B", 11)
+            self.set_text_color(100, 100, 100)
+            self.cell(0, 10, self.doc_title, align="L")
+            self.cell(0, 10, self.date_str, align="R", new_x="LMARGIN", new_y="NEXT")
+            self.line(10, 22, 200, 22)
+            self.ln(8)
+
+        def footer(self):
+            self.set_y(-15)
+            self.set_font(self.font_name, "I", 8)
+            self.set_text_color(128, 128, 128)
+            self.cell(0, 10, f"Page {self.page_no()}/{{nb}}", align="C")
 
-    @property
-    def font_name(self):
-        return self._font_family
+    return DocumentPDF
 
-    def header(self):
-        self.set_font(self.font_name, "B", 11)
-        self.set_text_color(100, 100, 100)
-        self.cell(0, 10, self.doc_title, align="L")
-        self.cell(0, 10, datetime.now().strftime("%B %d, %Y"), align="R", new_x="LMARGIN", new_y="NEXT")
-        self.line(10, 22, 200, 22)
-        self.ln(8)
 
-    def footer(self):
-        self.set_y(-15)
-        self.set_font(self.font_name, "I", 8)
-        self.set_text_color(128, 128, 128)
-        self.cell(0, 10, f"Page {self.page_no()}/{{nb}}", align="C")
+def __getattr__(name: str):
+    # Keeps `from export_pdf import DocumentPDF` working with the deferred class
+    if name == "DocumentPDF":
+        return _document_pdf_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def render_pdf(text: str, title: str = "Document") -> bytes:
+    """
+    Render a plain text document to PDF bytes (no file is written).
+
+    Raises on rendering errors; export_to_pdf() is the error-handling wrapper.
+    """
+    pdf = _document_pdf_class()(title=title)
+    pdf.alias_nb_pages()
+    pdf.add_page()
+
+    # Render text line by line, detecting simple structure
+    lines = text.split('\n')
+    for line in lines:
+        stripped = line.strip()
+
+        if not stripped:
+            pdf.ln(4)
+            continue
+
+        kind = classify_line(stripped)
+
+        # ALL CAPS lines treated as section headings
+        if kind == HEADING:
+            pdf.ln(4)
+            pdf.set_font(pdf.font_name, "B", 13)
+            pdf.set_text_color(0, 51, 102)
+            pdf.multi_cell(0, 7, stripped, new_x="LMARGIN", new_y="NEXT")
+            pdf.ln(2)
+        # Lines ending with colon could be sub-headings
+        elif kind == SUBHEADING:
+            pdf.ln(2)
+            pdf.set_font(pdf.font_name, "B", 11)
+            pdf.set_text_color(51, 51, 51)
+            pdf.multi_cell(0, 6, stripped, new_x="LMARGIN", new_y="NEXT")
+            pdf.ln(1)
+        # Bullet points and numbered items
+        elif kind == BULLET or kind == NUMBERED:
+            pdf.set_font(pdf.font_name, "", 11)
+            pdf.set_text_color(0, 0, 0)
+            pdf.set_x(pdf.l_margin + 5)
+            pdf.multi_cell(0, 6, f"  {stripped}", new_x="LMARGIN", new_y="NEXT")
+        # Regular text
+        else:
+            pdf.set_font(pdf.font_name, "", 11)
+            pdf.set_text_color(0, 0, 0)
+            pdf.multi_cell(0, 6, stripped, new_x="LMARGIN", new_y="NEXT")
+
+    # fpdf2 returns the document bytes when no name is given
+    return bytes(pdf.output())
 
 
 def export_to_pdf(
     text: str,
     title: str = "Document",
     output_path: Optional[str] = None,
+    output_dir: Optional[Path] = None,
 ) -> Optional[str]:
     """
     Export plain text document to PDF.
@@ -134,72 +240,33 @@ def export_to_pdf(
     Args:
         text: The document text to export
         title: Title for the PDF header
-        output_path: Where to save. If None, saves to drafts directory.
+        output_path: Where to save. If None, saves to output_dir.
+        output_dir: Folder for the generated filename (default: drafts directory)
 
     Returns:
         Path to saved PDF, or None on error
     """
-    if not text.strip():
+    if not text or text.isspace():
         logger.error("No text to export")
         return None
 
     try:
-        pdf = DocumentPDF(title=title)
-        pdf.alias_nb_pages()
-        pdf.add_page()
-
-        # Render text line by line, detecting simple structure
-        lines = text.split('\n')
-        for line in lines:
-            stripped = line.strip()
-
-            if not stripped:
-                pdf.ln(4)
-                continue
-
-            # ALL CAPS lines treated as section headings
-            if stripped.isupper() and len(stripped) > 3 and len(stripped) < 80:
-                pdf.ln(4)
-                pdf.set_font(pdf.font_name, "B", 13)
-                pdf.set_text_color(0, 51, 102)
-                pdf.multi_cell(0, 7, stripped)
-                pdf.ln(2)
-            # Lines ending with colon could be sub-headings
-            elif stripped.endswith(':') and len(stripped) < 60:
-                pdf.ln(2)
-                pdf.set_font(pdf.font_name, "B", 11)
-                pdf.set_text_color(51, 51, 51)
-                pdf.multi_cell(0, 6, stripped)
-                pdf.ln(1)
-            # Bullet points
-            elif stripped.startswith('- ') or stripped.startswith('* '):
-                pdf.set_font(pdf.font_name, "", 11)
-                pdf.set_text_color(0, 0, 0)
-                pdf.set_x(pdf.l_margin + 5)
-                pdf.multi_cell(0, 6, f"  {stripped}")
-            # Numbered items
-            elif re.match(r'^\d+[\.\)]\s', stripped):
-                pdf.set_font(pdf.font_name, "", 11)
-                pdf.set_text_color(0, 0, 0)
-                pdf.set_x(pdf.l_margin + 5)
-                pdf.multi_cell(0, 6, f"  {stripped}")
-            # Regular text
-            else:
-                pdf.set_font(pdf.font_name, "", 11)
-                pdf.set_text_color(0, 0, 0)
-                pdf.multi_cell(0, 6, stripped)
+        data = render_pdf(text, title)
 
         # Determine output path
         if output_path is None:
-            clean_name = re.sub(r'[^\w\s-]', '', title)[:30].replace(' ', '_')
+            clean_name = _CLEAN_NAME_RE.sub('', title)[:30].replace(' ', '_')
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{clean_name}_{timestamp}.pdf"
-            output_path = str(DRAFTS_DIR / filename)
-
-        # Ensure directory exists
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-
-        pdf.output(output_path)
+            output_path = str((output_dir or DRAFTS_DIR) / filename)
+
+        path = Path(output_path)
+        try:
+            path.write_bytes(data)
+        except FileNotFoundError:
+            # Parent missing (custom path, or drafts dir removed) — create and retry
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
         logger.info(f"PDF exported: {output_path}")
         return output_path
 
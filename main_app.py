@@ -12,11 +12,12 @@ Enhancement: Initial implementation
 
 Features:
 - Three-panel layout: templates, editor, actions
-- Generate drafts from notes using Claude AI
+- Generate drafts from notes using Claude AI (streamed into the editor)
 - Refine text with custom instructions
+- Batch-generate saved drafts via the Message Batches API (pending batches resume on restart)
 - Export to PDF and Word
 - Save/load drafts
-- Background threading for API calls
+- Background thread pool for API calls (results delivered via <<AIResult>> events)
 - Large fonts for accessibility
 
 UV ENVIRONMENT: Run with `uv run python main_app.py`
@@ -25,10 +26,11 @@ INSTALLATION:
 uv add anthropic fpdf2 python-docx python-dotenv pydantic
 """
 
-import threading
 import tkinter as tk
+import tkinter.font as tkfont
 import tkinter.simpledialog
 from tkinter import ttk, messagebox, filedialog, scrolledtext
+from concurrent.futures import ThreadPoolExecutor
 from queue import Queue, Empty
 
 from config import (
@@ -41,11 +43,23 @@ from config import (
     BUTTON_WIDTH, BUTTON_HEIGHT, BUTTON_PADX, BUTTON_PADY,
     ANTHROPIC_API_KEY,
 )
-from templates import TEMPLATES, TONE_OPTIONS
-from ai_writer import generate_draft, refine_text
-from export_pdf import export_to_pdf
-from export_docx import export_to_docx
-from draft_storage import save_draft, load_draft, list_drafts
+from templates import TEMPLATES, TEMPLATE_INDEX_BY_NAME, TONE_OPTIONS, get_template_by_name
+# ai_writer, export_pdf, export_docx and draft_storage are imported where
+# they're used, so the window appears without waiting on pydantic/asyncio
+
+# Result queue polling, only used when Tcl isn't thread-enabled (workers
+# can't post events then): fast while a request is running, slow when idle
+POLL_BUSY_MS = 50
+POLL_IDLE_MS = 500
+
+# Rows added to the Load Draft list per scroll step
+LOAD_PAGE_SIZE = 50
+
+# Drafts listed before "Show all" is clicked
+RECENT_DRAFTS = 50
+
+# Batches take minutes to hours, so check on them infrequently
+BATCH_POLL_MS = 30_000
 
 
 class DocumentWriterApp:
@@ -60,8 +74,19 @@ class DocumentWriterApp:
 
         # State
         self.selected_template_idx = 0
+        self._prev_template_idx = None  # Button currently drawn as selected
         self.result_queue = Queue()
         self.is_busy = False
+        # Reused worker threads for API calls; also bounds how many run at once
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai")
+        self._closing = False
+        self._wc_after_id = None  # Pending debounced word count
+        self._poll_after_id = None
+        # Python-side copy of doc_text, re-read only after an edit
+        self._doc_cache = ""
+        self._doc_cache_dirty = True
+        self._stream_has_text = False  # Whether the current request has shown any text yet
+        self._stream_error = None  # Error message for the current request, shown when it ends
 
         # Build UI
         self._build_ui()
@@ -69,19 +94,30 @@ class DocumentWriterApp:
         # Select first template
         self._select_template(0)
 
-        # Poll for background results
-        self.root.after(100, self._poll_queue)
+        # Background results: workers wake the UI with a virtual event
+        self.root.bind("<<AIResult>>", self._drain_queue)
+        self._threaded_tcl = self.root.tk.eval("info exists tcl_platform(threaded)") == "1"
+        if not self._threaded_tcl:
+            self._poll_after_id = self.root.after(POLL_IDLE_MS, self._drain_queue)
 
     def _build_ui(self):
         """Build the three-panel layout."""
 
+        # Named fonts, created once and shared by every widget (a tuple per
+        # widget makes Tk resolve a separate font for each one)
+        self.font_small = tkfont.Font(family=FONT_FAMILY, size=FONT_SIZE_SMALL)
+        self.font_small_bold = tkfont.Font(family=FONT_FAMILY, size=FONT_SIZE_SMALL, weight="bold")
+        self.font_normal = tkfont.Font(family=FONT_FAMILY, size=FONT_SIZE_NORMAL)
+        self.font_normal_bold = tkfont.Font(family=FONT_FAMILY, size=FONT_SIZE_NORMAL, weight="bold")
+        self.font_heading = tkfont.Font(family=FONT_FAMILY, size=FONT_SIZE_HEADING, weight="bold")
+
         # ── Top title bar ──
         title_frame = tk.Frame(self.root, bg=HEADING_COLOR, height=50)
         title_frame.pack(fill=tk.X)
         title_frame.pack_propagate(False)
         tk.Label(
             title_frame, text="AI Document Writer",
-            font=(FONT_FAMILY, FONT_SIZE_HEADING, "bold"),
+            font=self.font_heading,
             bg=HEADING_COLOR, fg="white",
         ).pack(side=tk.LEFT, padx=15, pady=8)
 
@@ -102,8 +138,9 @@ class DocumentWriterApp:
         self._build_actions(main_frame)
 
         # ── Bind doc_text events (after all widgets exist) ──
+        # <<Modified>> fires for every edit (typed, pasted or programmatic) but
+        # not for navigation keys, so it's the only trigger the word count needs
         self.doc_text.bind("<<Modified>>", self._on_text_modified)
-        self.doc_text.bind("<KeyRelease>", lambda e: self._update_word_count())
 
     def _build_sidebar(self, parent):
         """Build the template selection sidebar."""
@@ -113,7 +150,7 @@ class DocumentWriterApp:
 
         tk.Label(
             sidebar, text="Templates",
-            font=(FONT_FAMILY, FONT_SIZE_NORMAL, "bold"),
+            font=self.font_normal_bold,
             bg=SIDEBAR_BG,
         ).pack(pady=(10, 5))
 
@@ -122,7 +159,7 @@ class DocumentWriterApp:
             btn = tk.Button(
                 sidebar,
                 text=template.display_name,
-                font=(FONT_FAMILY, FONT_SIZE_SMALL),
+                font=self.font_small,
                 width=16,
                 height=1,
                 relief=tk.FLAT,
@@ -143,14 +180,14 @@ class DocumentWriterApp:
         # ── Notes input ──
         notes_label = tk.Label(
             editor_frame, text="YOUR NOTES / BULLET POINTS:",
-            font=(FONT_FAMILY, FONT_SIZE_NORMAL, "bold"),
+            font=self.font_normal_bold,
             bg=BG_COLOR, anchor="w",
         )
         notes_label.pack(fill=tk.X, pady=(0, 3))
 
         self.notes_text = scrolledtext.ScrolledText(
             editor_frame,
-            font=(FONT_FAMILY, FONT_SIZE_NORMAL),
+            font=self.font_normal,
             height=8,
             wrap=tk.WORD,
             bg=TEXT_BG,
@@ -165,14 +202,14 @@ class DocumentWriterApp:
         # ── Generated document output ──
         doc_label = tk.Label(
             editor_frame, text="GENERATED DOCUMENT:",
-            font=(FONT_FAMILY, FONT_SIZE_NORMAL, "bold"),
+            font=self.font_normal_bold,
             bg=BG_COLOR, anchor="w",
         )
         doc_label.pack(fill=tk.X, pady=(0, 3))
 
         self.doc_text = scrolledtext.ScrolledText(
             editor_frame,
-            font=(FONT_FAMILY, FONT_SIZE_NORMAL),
+            font=self.font_normal,
             wrap=tk.WORD,
             bg=TEXT_BG,
             relief=tk.SOLID,
@@ -189,7 +226,7 @@ class DocumentWriterApp:
         # Generate button
         self.generate_btn = tk.Button(
             actions, text="Generate\nDraft",
-            font=(FONT_FAMILY, FONT_SIZE_NORMAL, "bold"),
+            font=self.font_normal_bold,
             width=BUTTON_WIDTH, height=BUTTON_HEIGHT,
             bg=BUTTON_BG, fg=BUTTON_FG,
             activebackground=BUTTON_ACTIVE_BG, activeforeground=BUTTON_FG,
@@ -200,13 +237,13 @@ class DocumentWriterApp:
         # Refine section
         tk.Label(
             actions, text="Refine:",
-            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            font=self.font_small,
             bg=BG_COLOR, anchor="w",
         ).pack(fill=tk.X, padx=BUTTON_PADX, pady=(15, 2))
 
         self.refine_entry = tk.Entry(
             actions,
-            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            font=self.font_small,
             width=18,
         )
         self.refine_entry.pack(padx=BUTTON_PADX, pady=(0, 3))
@@ -215,7 +252,7 @@ class DocumentWriterApp:
 
         self.refine_btn = tk.Button(
             actions, text="Refine",
-            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            font=self.font_small,
             width=BUTTON_WIDTH, height=1,
             bg="#059669", fg=BUTTON_FG,
             activebackground="#047857", activeforeground=BUTTON_FG,
@@ -229,7 +266,7 @@ class DocumentWriterApp:
         # Tone selector
         tk.Label(
             actions, text="Tone:",
-            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            font=self.font_small,
             bg=BG_COLOR, anchor="w",
         ).pack(fill=tk.X, padx=BUTTON_PADX, pady=(0, 2))
 
@@ -238,7 +275,7 @@ class DocumentWriterApp:
             actions,
             textvariable=self.tone_var,
             values=TONE_OPTIONS,
-            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            font=self.font_small,
             width=16,
             state="readonly",
         )
@@ -251,12 +288,13 @@ class DocumentWriterApp:
         for text, cmd, color in [
             ("Save Draft", self._on_save, "#6B7280"),
             ("Load Draft", self._on_load, "#6B7280"),
+            ("Batch Generate", self._on_batch_generate, "#6B7280"),
             ("Export PDF", self._on_export_pdf, "#7C3AED"),
             ("Export Word", self._on_export_docx, "#7C3AED"),
         ]:
             tk.Button(
                 actions, text=text,
-                font=(FONT_FAMILY, FONT_SIZE_SMALL),
+                font=self.font_small,
                 width=BUTTON_WIDTH, height=1,
                 bg=color, fg=BUTTON_FG,
                 activebackground=color, activeforeground=BUTTON_FG,
@@ -271,14 +309,14 @@ class DocumentWriterApp:
 
         self.status_label = tk.Label(
             status_frame, text="Ready",
-            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            font=self.font_small,
             bg=STATUS_BG, anchor="w",
         )
         self.status_label.pack(side=tk.LEFT, padx=10)
 
         self.word_count_label = tk.Label(
             status_frame, text="Words: 0",
-            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            font=self.font_small,
             bg=STATUS_BG, anchor="e",
         )
         self.word_count_label.pack(side=tk.RIGHT, padx=10)
@@ -290,16 +328,15 @@ class DocumentWriterApp:
         self.selected_template_idx = idx
         template = TEMPLATES[idx]
 
-        # Update button highlights
-        for i, btn in enumerate(self.template_buttons):
-            if i == idx:
-                btn.configure(bg=SELECTED_BG, relief=tk.SUNKEN)
-            else:
-                btn.configure(bg=SIDEBAR_BG, relief=tk.FLAT)
+        # Update button highlights (only the old and new selection change)
+        if idx != self._prev_template_idx:
+            if self._prev_template_idx is not None:
+                self.template_buttons[self._prev_template_idx].configure(bg=SIDEBAR_BG, relief=tk.FLAT)
+            self.template_buttons[idx].configure(bg=SELECTED_BG, relief=tk.SUNKEN)
+            self._prev_template_idx = idx
 
-        # Update notes placeholder if notes area is empty
-        current_notes = self.notes_text.get("1.0", tk.END).strip()
-        if not current_notes or self._notes_has_placeholder:
+        # Update notes placeholder if notes area is empty (flag first: no text read)
+        if self._notes_has_placeholder or not self.notes_text.get("1.0", "end-1c").strip():
             self._show_placeholder(template.placeholder)
 
         self._set_status(f"Template: {template.display_name}")
@@ -308,8 +345,7 @@ class DocumentWriterApp:
 
     def _show_placeholder(self, text: str):
         """Show placeholder text in the notes area."""
-        self.notes_text.delete("1.0", tk.END)
-        self.notes_text.insert("1.0", text)
+        self.notes_text.replace("1.0", tk.END, text)
         self.notes_text.configure(fg="#999999")
         self._notes_has_placeholder = True
 
@@ -352,12 +388,17 @@ class DocumentWriterApp:
 
         def _worker():
             try:
-                result = generate_draft(template, notes, tone)
-                self.result_queue.put(("draft", result))
+                from ai_writer import StreamError, generate_draft_stream
+                for chunk in generate_draft_stream(template, notes, tone):
+                    if self._closing:
+                        break
+                    self._post_result("error" if isinstance(chunk, StreamError) else "delta", chunk)
             except Exception as e:
-                self.result_queue.put(("draft", f"Error generating draft: {e}"))
+                self._post_result("error", f"Error generating draft: {e}")
+            finally:
+                self._post_result("done", None)
 
-        threading.Thread(target=_worker, daemon=True).start()
+        self._executor.submit(_worker)
 
     # ── Refine Text ──
 
@@ -366,7 +407,7 @@ class DocumentWriterApp:
         if self.is_busy:
             return
 
-        current_text = self.doc_text.get("1.0", tk.END).strip()
+        current_text = self._get_doc().strip()
         if not current_text:
             messagebox.showinfo("No Document", "Generate a draft first before refining.")
             return
@@ -381,18 +422,25 @@ class DocumentWriterApp:
 
         def _worker():
             try:
-                result = refine_text(current_text, instruction, template.name)
-                self.result_queue.put(("draft", result))
+                from ai_writer import StreamError, refine_text_stream
+                for chunk in refine_text_stream(current_text, instruction, template.name):
+                    if self._closing:
+                        break
+                    self._post_result("error" if isinstance(chunk, StreamError) else "delta", chunk)
             except Exception as e:
-                self.result_queue.put(("draft", f"Error refining text: {e}"))
+                self._post_result("error", f"Error refining text: {e}")
+            finally:
+                self._post_result("done", None)
 
-        threading.Thread(target=_worker, daemon=True).start()
+        self._executor.submit(_worker)
 
     # ── Save / Load ──
 
     def _on_save(self):
         """Save the current draft."""
-        doc_text = self.doc_text.get("1.0", tk.END).strip()
+        from draft_storage import save_draft
+
+        doc_text = self._get_doc().strip()
         notes = self._get_notes()
 
         if not doc_text and not notes:
@@ -427,6 +475,8 @@ class DocumentWriterApp:
 
     def _on_load(self):
         """Load a saved draft."""
+        from draft_storage import list_drafts, load_draft
+
         drafts = list_drafts()
         if not drafts:
             messagebox.showinfo("No Drafts", "No saved drafts found.")
@@ -441,63 +491,277 @@ class DocumentWriterApp:
 
         tk.Label(
             load_win, text="Select a draft to load:",
-            font=(FONT_FAMILY, FONT_SIZE_NORMAL, "bold"),
+            font=self.font_normal_bold,
         ).pack(pady=10)
 
-        listbox = tk.Listbox(
-            load_win,
-            font=(FONT_FAMILY, FONT_SIZE_SMALL),
-            height=15,
-            selectmode=tk.SINGLE,
+        style = ttk.Style(load_win)
+        style.configure(
+            "Drafts.Treeview",
+            font=self.font_small,
+            rowheight=self.font_small.metrics("linespace") + 6,
         )
-        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
-        for d in drafts:
-            saved_at = d["saved_at"][:19].replace("T", " ") if d["saved_at"] else "Unknown"
-            listbox.insert(tk.END, f"{d['title']}  ({saved_at})")
+        tree_frame = tk.Frame(load_win)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree = ttk.Treeview(
+            tree_frame,
+            columns=("title", "saved_at"),
+            show="headings",
+            selectmode="browse",
+            style="Drafts.Treeview",
+            height=15,
+        )
+        tree.heading("title", text="Title", anchor="w")
+        tree.heading("saved_at", text="Saved", anchor="w")
+        tree.column("saved_at", width=150, stretch=False)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.configure(command=tree.yview)
+
+        # Rows are inserted a page at a time as the list scrolls near its end,
+        # so the dialog opens just as fast with thousands of drafts
+        shown = 0
+        limit = min(RECENT_DRAFTS, len(drafts))
+
+        def _add_rows():
+            nonlocal shown
+            end = min(shown + LOAD_PAGE_SIZE, limit)
+            for i in range(shown, end):
+                d = drafts[i]
+                saved_at = d["saved_at"][:19].replace("T", " ") if d["saved_at"] else "Unknown"
+                tree.insert("", tk.END, iid=str(i), values=(d["title"], saved_at))
+            shown = end
+
+        def _on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= 0.9 and shown < limit:
+                _add_rows()
+
+        tree.configure(yscrollcommand=_on_scroll)
+        _add_rows()
+
+        def _show_all():
+            nonlocal limit
+            limit = len(drafts)
+            _add_rows()
+            show_all_btn.destroy()
 
         def _do_load():
-            sel = listbox.curselection()
+            sel = tree.selection()
             if not sel:
                 return
-            draft_info = drafts[sel[0]]
+            draft_info = drafts[int(sel[0])]
             draft = load_draft(draft_info["filepath"])
             if draft:
                 # Restore template
-                for i, t in enumerate(TEMPLATES):
-                    if t.name == draft.template_name:
-                        self._select_template(i)
-                        break
+                idx = TEMPLATE_INDEX_BY_NAME.get(draft.template_name)
+                if idx is not None:
+                    self._select_template(idx)
 
                 # Restore tone
                 self.tone_var.set(draft.tone)
 
                 # Restore notes
-                self.notes_text.delete("1.0", tk.END)
-                self.notes_text.insert("1.0", draft.notes)
-                self.notes_text.configure(fg="black")
+                if draft.notes.strip():
+                    self.notes_text.replace("1.0", tk.END, draft.notes)
+                    self.notes_text.configure(fg="black")
+                    self._notes_has_placeholder = False
+                else:
+                    # Clear notes left from the previous document
+                    self._show_placeholder(TEMPLATES[self.selected_template_idx].placeholder)
 
                 # Restore document
-                self.doc_text.delete("1.0", tk.END)
-                self.doc_text.insert("1.0", draft.document_text)
+                self._set_doc(draft.document_text)
                 self._update_word_count()
                 self._set_status(f"Loaded: {draft.title}")
 
             load_win.destroy()
 
+        button_row = tk.Frame(load_win)
+        button_row.pack(pady=10)
         tk.Button(
-            load_win, text="Load Selected",
-            font=(FONT_FAMILY, FONT_SIZE_NORMAL),
+            button_row, text="Load Selected",
+            font=self.font_normal,
             width=15, height=1,
             bg=BUTTON_BG, fg=BUTTON_FG,
             command=_do_load,
+        ).pack(side=tk.LEFT, padx=5)
+        if len(drafts) > limit:
+            show_all_btn = tk.Button(
+                button_row, text=f"Show All ({len(drafts)})",
+                font=self.font_normal,
+                width=15, height=1,
+                command=_show_all,
+            )
+            show_all_btn.pack(side=tk.LEFT, padx=5)
+
+    # ── Batch Generate ──
+
+    def _on_batch_generate(self):
+        """Regenerate several saved drafts in one Message Batch."""
+        from draft_storage import list_drafts, load_draft
+
+        drafts = list_drafts()
+        if not drafts:
+            messagebox.showinfo("No Drafts", "No saved drafts found.")
+            return
+
+        batch_win = tk.Toplevel(self.root)
+        batch_win.title("Batch Generate")
+        batch_win.geometry("500x400")
+        batch_win.transient(self.root)
+        batch_win.grab_set()
+
+        tk.Label(
+            batch_win, text="Select drafts to regenerate (results are saved as new drafts):",
+            font=self.font_small_bold,
+        ).pack(pady=10)
+
+        listbox = tk.Listbox(
+            batch_win,
+            font=self.font_small,
+            height=15,
+            selectmode=tk.EXTENDED,
+        )
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        for d in drafts:
+            saved_at = d["saved_at"][:19].replace("T", " ") if d["saved_at"] else "Unknown"
+            listbox.insert(tk.END, f"{d['title']}  ({saved_at})")
+
+        def _do_submit():
+            sel = listbox.curselection()
+            if not sel:
+                return
+            selected = [drafts[i]["filepath"] for i in sel]
+            batch_win.destroy()
+            self._set_status(f"Submitting batch of {len(selected)} drafts...")
+
+            def _worker():
+                try:
+                    from ai_writer import submit_draft_batch
+                    from draft_storage import add_pending_batch
+
+                    # Batch custom_ids must be short and alphanumeric, so map them to the loaded drafts
+                    loaded = {}
+                    for i, filepath in enumerate(selected):
+                        draft = load_draft(filepath)
+                        if draft and draft.notes.strip():
+                            loaded[f"draft-{i}"] = draft.model_dump(
+                                include={"title", "template_name", "tone", "notes"},
+                            )
+                    batch_id = submit_draft_batch({
+                        custom_id: (get_template_by_name(d["template_name"]), d["notes"], d["tone"])
+                        for custom_id, d in loaded.items()
+                    })
+                    if batch_id:
+                        # Recorded on disk so results are still collected if the app is closed first
+                        add_pending_batch(batch_id, loaded)
+                    self._post_result("batch_submitted", (batch_id, loaded))
+                except Exception as e:
+                    self._post_result("batch_submitted", (None, {}, str(e)))
+
+            self._executor.submit(_worker)
+
+        tk.Button(
+            batch_win, text="Submit Batch",
+            font=self.font_normal,
+            width=15, height=1,
+            bg=BUTTON_BG, fg=BUTTON_FG,
+            command=_do_submit,
         ).pack(pady=10)
 
+    def _check_batch(self, batch_id: str, drafts: dict):
+        """Check a submitted batch in the background; results come back via _post_result()."""
+        def _worker():
+            try:
+                from ai_writer import get_batch_results
+
+                results = get_batch_results(batch_id)
+                self._post_result("batch_results", (batch_id, drafts, results))
+            except Exception as e:
+                self._post_result("batch_check_failed", (batch_id, drafts, str(e)))
+
+        self._executor.submit(_worker)
+
+    def _resume_batches(self):
+        """Resume polling batches left pending when the app was last closed."""
+        def _worker():
+            from draft_storage import load_pending_batches
+
+            for batch_id, drafts in load_pending_batches().items():
+                self._post_result("batch_resumed", (batch_id, drafts))
+
+        self._executor.submit(_worker)
+
+    def _on_batch_resumed(self, batch_id: str, drafts: dict):
+        """Check a batch from a previous session straight away."""
+        self._set_status(f"Checking batch from last session ({len(drafts)} drafts)...")
+        self._check_batch(batch_id, drafts)
+
+    def _on_batch_submitted(self, batch_id, drafts: dict, error: str = ""):
+        """Start polling a newly submitted batch."""
+        if not batch_id:
+            self._set_status("Batch submission failed")
+            if error:
+                messagebox.showerror("Error", f"Failed to submit batch:\n{error}")
+            else:
+                messagebox.showerror("Error", "Failed to submit batch. Check that the drafts have notes.")
+            return
+        self._set_status(f"Batch submitted ({len(drafts)} drafts) — results will be saved as drafts")
+        self.root.after(BATCH_POLL_MS, self._check_batch, batch_id, drafts)
+
+    def _on_batch_check_failed(self, batch_id: str, drafts: dict, error: str):
+        """Report a batch check that raised, and try again at the next poll."""
+        self._set_status(f"Couldn't check batch ({error}) — retrying")
+        self.root.after(BATCH_POLL_MS, self._check_batch, batch_id, drafts)
+
+    def _on_batch_results(self, batch_id: str, drafts: dict, results):
+        """Save finished batch results as new drafts, keep polling, or report a dead batch."""
+        from draft_storage import remove_pending_batch, save_draft
+
+        if results.status in ("processing", "unavailable"):
+            self.root.after(BATCH_POLL_MS, self._check_batch, batch_id, drafts)
+            return
+
+        if results.status == "failed":
+            remove_pending_batch(batch_id)
+            self._set_status("Batch could not be retrieved")
+            messagebox.showerror(
+                "Batch Failed",
+                f"Results for batch {batch_id} can no longer be retrieved:\n{results.error}",
+            )
+            return
+
+        saved = 0
+        for custom_id, text in results.texts.items():
+            draft = drafts.get(custom_id)
+            if draft is None:
+                continue
+            if save_draft(
+                title=draft["title"],
+                template_name=draft["template_name"],
+                tone=draft["tone"],
+                notes=draft["notes"],
+                document_text=text,
+            ):
+                saved += 1
+        remove_pending_batch(batch_id)
+
+        self._set_status(f"Batch complete: {saved} of {len(drafts)} drafts saved")
+        message = f"{saved} of {len(drafts)} drafts regenerated.\nUse Load Draft to open them."
+        if results.errors:
+            message += f"\n\n{len(results.errors)} failed ({', '.join(sorted(set(results.errors.values())))})."
+        messagebox.showinfo("Batch Complete", message)
+
     # ── Export ──
 
     def _on_export_pdf(self):
         """Export the document to PDF."""
-        doc_text = self.doc_text.get("1.0", tk.END).strip()
+        from export_pdf import export_to_pdf
+
+        doc_text = self._get_doc().strip()
         if not doc_text:
             messagebox.showinfo("No Document", "Generate a document first.")
             return
@@ -513,7 +777,9 @@ class DocumentWriterApp:
 
     def _on_export_docx(self):
         """Export the document to Word (.docx)."""
-        doc_text = self.doc_text.get("1.0", tk.END).strip()
+        from export_docx import export_to_docx
+
+        doc_text = self._get_doc().strip()
         if not doc_text:
             messagebox.showinfo("No Document", "Generate a document first.")
             return
@@ -527,21 +793,75 @@ class DocumentWriterApp:
         else:
             messagebox.showerror("Error", "Failed to export Word document.")
 
-    # ── Background Task Polling ──
+    # ── Background Results ──
 
-    def _poll_queue(self):
-        """Check for results from background threads."""
+    def _post_result(self, msg_type: str, data):
+        """Queue a result from a worker thread and wake the UI to handle it."""
+        self.result_queue.put((msg_type, data))
+        if self._threaded_tcl:
+            try:
+                self.root.event_generate("<<AIResult>>", when="tail")
+            except (tk.TclError, RuntimeError):
+                pass  # Window closed while the worker was running
+
+    def _drain_queue(self, event=None):
+        """Handle all queued results from background threads."""
         try:
             while True:
                 msg_type, data = self.result_queue.get_nowait()
-                if msg_type == "draft":
-                    self.doc_text.delete("1.0", tk.END)
-                    self.doc_text.insert("1.0", data)
-                    self._update_word_count()
-                    self._set_busy(False, "Document ready")
+                if msg_type == "delta":
+                    self._append_stream(data)
+                elif msg_type == "error":
+                    self._stream_error = data
+                elif msg_type == "done":
+                    self._finish_stream()
+                elif msg_type == "batch_submitted":
+                    self._on_batch_submitted(*data)
+                elif msg_type == "batch_results":
+                    self._on_batch_results(*data)
+                elif msg_type == "batch_resumed":
+                    self._on_batch_resumed(*data)
+                elif msg_type == "batch_check_failed":
+                    self._on_batch_check_failed(*data)
         except Empty:
             pass
-        self.root.after(100, self._poll_queue)
+        if not self._threaded_tcl:
+            interval = POLL_BUSY_MS if self.is_busy else POLL_IDLE_MS
+            self._poll_after_id = self.root.after(interval, self._drain_queue)
+
+    def _append_stream(self, chunk: str):
+        """Show the next streamed chunk; the first one replaces the old document."""
+        if not self._stream_has_text:
+            self._stream_has_text = True
+            self._set_doc(chunk.lstrip())
+        else:
+            self.doc_text.insert(tk.END, chunk)
+            self._doc_cache_dirty = True
+        self.doc_text.see(tk.END)
+
+    def _finish_stream(self):
+        """Tidy up the streamed document, leave the busy state, and report any error."""
+        if self._stream_has_text:
+            text = self._get_doc()
+            if text != text.strip():
+                self._set_doc(text.strip())
+        elif self._stream_error is None:
+            self._set_doc("")
+        self._update_word_count()
+
+        error = self._stream_error
+        if error is None:
+            self._set_busy(False, "Document ready")
+        elif self._stream_has_text:
+            # Keep what arrived, but never mix the error into the document
+            self._set_busy(False, "Document incomplete — generation stopped early")
+            messagebox.showerror(
+                "Incomplete Document",
+                f"{error}\n\nThe text received so far is in the editor but is incomplete.",
+            )
+        else:
+            self._set_busy(False, error)
+            messagebox.showerror("Error", error)
 
     # ── UI Helpers ──
 
@@ -549,6 +869,12 @@ class DocumentWriterApp:
         """Set the busy state and update UI."""
         self.is_busy = busy
         if busy:
+            self._stream_has_text = False
+            self._stream_error = None
+            if not self._threaded_tcl:
+                # Switch to fast polling now rather than after the idle interval
+                self.root.after_cancel(self._poll_after_id)
+                self._poll_after_id = self.root.after(POLL_BUSY_MS, self._drain_queue)
             self.generate_btn.configure(state=tk.DISABLED)
             self.refine_btn.configure(state=tk.DISABLED)
             self._set_status(message or "Working...")
@@ -561,16 +887,41 @@ class DocumentWriterApp:
         """Update the status bar text."""
         self.status_label.configure(text=text)
 
+    def _get_doc(self) -> str:
+        """Current document text, without copying it out of Tk unless it changed."""
+        if self._doc_cache_dirty:
+            self._doc_cache = self.doc_text.get("1.0", "end-1c")
+            self._doc_cache_dirty = False
+        return self._doc_cache
+
+    def _set_doc(self, text: str):
+        """Replace the document text."""
+        self.doc_text.replace("1.0", tk.END, text)
+        # The widget now holds exactly this text; <<Modified>> arrives later
+        self._doc_cache = text
+        self._doc_cache_dirty = False
+
+    def _schedule_word_count(self):
+        """Recount words once typing pauses, instead of on every keystroke."""
+        if self._wc_after_id:
+            self.root.after_cancel(self._wc_after_id)
+        self._wc_after_id = self.root.after(150, self._update_word_count)
+
     def _update_word_count(self):
         """Update the word count display."""
-        text = self.doc_text.get("1.0", tk.END).strip()
-        words = len(text.split()) if text else 0
+        if self._wc_after_id:
+            self.root.after_cancel(self._wc_after_id)
+            self._wc_after_id = None
+        # str.split() already ignores leading/trailing whitespace, so no strip()
+        # copy; it's also several times faster than counting regex matches
+        words = len(self._get_doc().split())
         self.word_count_label.configure(text=f"Words: {words}")
 
     def _on_text_modified(self, event=None):
         """Handle text modification events."""
         self.doc_text.edit_modified(False)
-        self._update_word_count()
+        self._doc_cache_dirty = True
+        self._schedule_word_count()
 
     def run(self):
         """Start the application."""
@@ -581,8 +932,25 @@ class DocumentWriterApp:
                 "Create a .env file in the app directory with:\n"
                 "ANTHROPIC_API_KEY=your_key_here"
             )
+        else:
+            # Build the shared API client while the user types their notes
+            self._executor.submit(self._prepare_client)
+            self._resume_batches()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self.root.mainloop()
 
+    def _on_close(self):
+        """Drop queued work, stop any stream at its next chunk, and close the window."""
+        self._closing = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+
+    @staticmethod
+    def _prepare_client():
+        """Import ai_writer and create its client off the UI thread."""
+        from ai_writer import prepare_client
+        prepare_client()
+
 
 def main():
     """Entry point."""
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Module: Near-duplicate response cache for AI Document Writer
+Version: 1.0.0
+Development Iteration: v1
+
+Project: AI Document Writer
+Developer: Kent Benson
+Created: 2026-10-15
+
+Enhancement: Initial implementation
+
+Features:
+- Reuse a previous draft when notes are nearly identical to an earlier request
+- Bag-of-words cosine similarity (no embedding model or numpy required)
+- Hits also require the same numbers, names and negations, so a draft is never
+  reused for notes whose facts differ ("5000" vs "50000", "John" vs "Jane")
+- Entries bucketed by model + template prompt hash + tone, so prompt edits invalidate them
+- Persisted atomically to DRAFTS_DIR/.sem_cache.json, capped at SEMANTIC_CACHE_MAX_ENTRIES
+
+UV ENVIRONMENT: Run with `uv run python semantic_cache.py`
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Optional
+
+from config import DRAFTS_DIR, SEMANTIC_CACHE_MAX_ENTRIES, SEMANTIC_CACHE_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+# Tokens a near-duplicate must share exactly: numbers, capitalized words, negations
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+_CAPITALIZED_RE = re.compile(r"\b[A-Z]\w*")
+_NEGATION_RE = re.compile(r"\b(?:not|no|never|none|nor|without|cannot)\b|n't\b", re.IGNORECASE)
+
+_lock = threading.Lock()
+_entries: Optional[list[dict]] = None  # Lazy-loaded from disk
+
+
+def _cache_path():
+    return DRAFTS_DIR / ".sem_cache.json"
+
+
+def bucket_key(model: str, system_prompt: str, tone: str) -> str:
+    """Hash of the model, template prompt and tone; only notes within a bucket are compared."""
+    return hashlib.sha256(f"{model}\x00{system_prompt}\x00{tone}".encode("utf-8")).hexdigest()
+
+
+def facts(text: str) -> list[str]:
+    """Sorted numbers, capitalized words and negations in text."""
+    return sorted(
+        _NUMBER_RE.findall(text)
+        + _CAPITALIZED_RE.findall(text)
+        + [m.lower() for m in _NEGATION_RE.findall(text)]
+    )
+
+
+def embed(text: str) -> dict[str, float]:
+    """L2-normalized term-frequency vector of lowercase word tokens."""
+    counts = Counter(_TOKEN_RE.findall(text.lower()))
+    norm = math.sqrt(sum(c * c for c in counts.values()))
+    if not norm:
+        return {}
+    return {token: c / norm for token, c in counts.items()}
+
+
+def similarity(a: dict[str, float], b: dict[str, float]) -> float:
+    """Cosine similarity of two normalized vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(token, 0.0) for token, weight in a.items())
+
+
+def _load() -> list[dict]:
+    global _entries
+    if _entries is None:
+        try:
+            _entries = json.loads(_cache_path().read_text())
+        except FileNotFoundError:
+            _entries = []
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable semantic cache: {e}")
+            _entries = []
+    return _entries
+
+
+def lookup(bucket: str, notes: str) -> Optional[str]:
+    """
+    Return the cached response for the most similar notes in bucket, if above
+    threshold and with exactly the same facts().
+    """
+    query = embed(notes)
+    if not query:
+        return None
+    query_facts = facts(notes)
+    with _lock:
+        best_score, best_text = 0.0, None
+        for entry in _load():
+            if entry["bucket"] != bucket or entry.get("facts") != query_facts:
+                continue
+            score = similarity(query, entry["vector"])
+            if score > best_score:
+                best_score, best_text = score, entry["text"]
+    if best_score >= SEMANTIC_CACHE_THRESHOLD:
+        logger.info(f"Semantic cache hit (similarity {best_score:.3f})")
+        return best_text
+    return None
+
+
+def update(bucket: str, notes: str, text: str) -> None:
+    """Add a response to the cache, evicting the oldest entries past the cap."""
+    vector = embed(notes)
+    if not vector:
+        return
+    with _lock:
+        entries = _load()
+        entries.append({"bucket": bucket, "vector": vector, "facts": facts(notes), "text": text})
+        del entries[:-SEMANTIC_CACHE_MAX_ENTRIES]
+        try:
+            # Write to a per-writer dotfile and rename so a crash mid-write can't corrupt the cache
+            path = _cache_path()
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(entries))
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"Failed to persist semantic cache: {e}")
+
+
+def clear() -> None:
+    """Drop the in-memory cache so it is reloaded from disk on next use."""
+    global _entries
+    with _lock:
+        _entries = None
@@ -21,7 +21,7 @@ UV ENVIRONMENT: Run with `uv run python templates.py`
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DocumentTemplate:
     """A document template with its AI system prompt."""
     name: str
@@ -31,7 +31,7 @@ class DocumentTemplate:
     placeholder: str  # Example input text for the notes area
 
 
-TEMPLATES = [
+TEMPLATES = (
     DocumentTemplate(
         name="formal_letter",
         display_name="Formal Letter",
@@ -130,7 +130,7 @@ TEMPLATES = [
         ),
         placeholder="Write about anything - enter your notes, ideas, or bullet points here",
     ),
-]
+)
 
 
 TONE_OPTIONS = [
@@ -143,9 +143,11 @@ TONE_OPTIONS = [
 ]
 
 
+# Name lookups built once at import
+TEMPLATES_BY_NAME = {t.name: t for t in TEMPLATES}
+TEMPLATE_INDEX_BY_NAME = {t.name: i for i, t in enumerate(TEMPLATES)}
+
+
 def get_template_by_name(name: str) -> DocumentTemplate:
     """Look up a template by its internal name."""
-    for t in TEMPLATES:
-        if t.name == name:
-            return t
-    return TEMPLATES[-1]  # Default to General
+    return TEMPLATES_BY_NAME.get(name, TEMPLATES[-1])  # Default to General
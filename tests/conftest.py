@@ -1,12 +1,16 @@
 """Shared fixtures for AI Document Writer tests."""
 
+import subprocess
 import sys
+from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
 # Ensure project root is importable
-sys.path.insert(0, str(Path(__file__).parent.parent))
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
 
 @pytest.fixture
@@ -16,11 +20,23 @@ def tmp_drafts_dir(tmp_path, monkeypatch):
     drafts.mkdir()
     monkeypatch.setattr("config.DRAFTS_DIR", drafts)
     monkeypatch.setattr("draft_storage.DRAFTS_DIR", drafts)
+    monkeypatch.setattr("draft_storage._list_cache", None)
+    monkeypatch.setattr("ai_writer.DRAFTS_DIR", drafts)
+    monkeypatch.setattr("semantic_cache.DRAFTS_DIR", drafts)
+    monkeypatch.setattr("semantic_cache._entries", None)
     monkeypatch.setattr("export_pdf.DRAFTS_DIR", drafts)
     monkeypatch.setattr("export_docx.DRAFTS_DIR", drafts)
     return drafts
 
 
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Every datetime.now() in draft_storage returns the same instant."""
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    monkeypatch.setattr("draft_storage.datetime", SimpleNamespace(now=lambda: now))
+    return now
+
+
 @pytest.fixture
 def sample_document_text():
     """Multi-format text with headings, bullets, numbered lists, and paragraphs."""
@@ -53,3 +69,16 @@ def sample_notes():
         "Re: Pothole on Main Street\n"
         "Been there 3 months, dangerous for cyclists"
     )
+
+
+@pytest.fixture
+def imports_after():
+    """Return a function listing the modules loaded by importing a module in a fresh interpreter."""
+    def _imports_after(module: str) -> set[str]:
+        code = f"import sys, {module}; print(' '.join(sys.modules))"
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        )
+        return set(out.stdout.split())
+    return _imports_after
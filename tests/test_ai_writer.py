@@ -1,6 +1,10 @@
 """Tests for ai_writer.py — API calls mocked via unittest.mock."""
 
-from unittest.mock import patch, MagicMock
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import AsyncMock, patch, MagicMock
 
 import pytest
 
@@ -18,6 +22,28 @@ def mock_client():
         yield mock
 
 
+@pytest.fixture
+def mock_async_client():
+    """Patch the AsyncAnthropic client in ai_writer module."""
+    mock = MagicMock()
+    mock_response = MagicMock()
+    mock_response.content = [MagicMock(text="Async document text.")]
+    mock.messages.create = AsyncMock(return_value=mock_response)
+    with patch("ai_writer._get_async_client", return_value=mock):
+        yield mock
+
+
+@pytest.fixture
+def mock_stream_client():
+    """Patch the Anthropic client with a streaming response of three chunks."""
+    mock = MagicMock()
+    stream = MagicMock()
+    stream.text_stream = iter(["Streamed ", "document ", "text."])
+    mock.messages.stream.return_value.__enter__.return_value = stream
+    with patch("ai_writer._get_client", return_value=mock):
+        yield mock
+
+
 @pytest.fixture
 def mock_api_key():
     """Ensure ANTHROPIC_API_KEY is set so generate/refine don't short-circuit."""
@@ -36,7 +62,18 @@ class TestGenerateDraft:
 
         call_kwargs = mock_client.messages.create.call_args
         system = call_kwargs.kwargs["system"]
-        assert template.system_prompt in system
+        assert template.system_prompt in system[0]["text"]
+
+    def test_marks_template_prompt_for_caching(self, mock_client, mock_api_key):
+        from ai_writer import generate_draft
+
+        template = get_template_by_name("report")
+        generate_draft(template, "My notes", "Formal")
+
+        system = mock_client.messages.create.call_args.kwargs["system"]
+        assert system[0]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in system[-1]
+        assert "Formal" not in system[0]["text"]
 
     def test_includes_tone_in_system_prompt(self, mock_client, mock_api_key):
         from ai_writer import generate_draft
@@ -46,7 +83,7 @@ class TestGenerateDraft:
 
         call_kwargs = mock_client.messages.create.call_args
         system = call_kwargs.kwargs["system"]
-        assert "Persuasive" in system
+        assert "Persuasive" in system[-1]["text"]
 
     def test_returns_generated_text(self, mock_client, mock_api_key):
         from ai_writer import generate_draft
@@ -129,3 +166,405 @@ class TestRefineText:
         mock_client.messages.create.side_effect = Exception("Network error")
         result = refine_text("Some text.", "Fix it")
         assert "error" in result.lower()
+
+
+class TestClients:
+    """Tests for the shared Anthropic client singletons."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_clients(self):
+        with patch("ai_writer._client", None), patch("ai_writer._async_client", None):
+            yield
+
+    def test_sync_client_is_reused_with_retries(self, mock_api_key):
+        from ai_writer import _get_client
+
+        client = _get_client()
+        assert _get_client() is client
+        assert client.max_retries == 3
+
+    def test_async_client_is_reused_with_retries(self, mock_api_key):
+        from ai_writer import _get_async_client
+
+        client = _get_async_client()
+        assert _get_async_client() is client
+        assert client.max_retries == 3
+
+    def test_prepare_client_creates_shared_client(self, mock_api_key):
+        import ai_writer
+
+        ai_writer.prepare_client()
+        assert ai_writer._client is not None
+        assert ai_writer._get_client() is ai_writer._client
+
+    def test_prepare_client_skipped_without_api_key(self):
+        import ai_writer
+
+        with patch("ai_writer.ANTHROPIC_API_KEY", ""):
+            ai_writer.prepare_client()
+        assert ai_writer._client is None
+
+
+class TestPromptSize:
+    """Guard against the fixed prompt text growing back (it is resent on every call)."""
+
+    def test_fixed_prompt_text_stays_compact(self):
+        from ai_writer import _DRAFT_OUTPUT_RULES, _REFINE_SYSTEM_PROMPT
+
+        assert len(_DRAFT_OUTPUT_RULES) <= 80
+        assert len(_REFINE_SYSTEM_PROMPT) <= 200
+
+    def test_draft_user_message_framing_is_compact(self):
+        from ai_writer import _draft_request
+
+        template = get_template_by_name("memo")
+        _, user_message = _draft_request(template, "NOTES", "Formal")
+        assert len(user_message) - len("NOTES") - len(template.display_name) <= 20
+
+
+class TestSystemBlocks:
+    """The fixed system blocks are built once and reused across calls."""
+
+    def test_template_block_reused(self, mock_client, mock_api_key):
+        from ai_writer import generate_draft
+
+        template = get_template_by_name("memo")
+        generate_draft(template, "First notes", "Formal")
+        generate_draft(template, "Second notes", "Casual")
+
+        first, second = (c.kwargs["system"] for c in mock_client.messages.create.call_args_list)
+        assert first[0] is second[0]
+        assert first[1] != second[1]
+
+    def test_refine_block_reused(self, mock_client, mock_api_key):
+        from ai_writer import refine_text
+
+        refine_text("Some text.", "Shorter")
+        refine_text("Other text.", "Longer")
+
+        first, second = (c.kwargs["system"] for c in mock_client.messages.create.call_args_list)
+        assert first[0] is second[0]
+
+
+class TestStreaming:
+    """Tests for generate_draft_stream() and refine_text_stream()."""
+
+    def test_generate_draft_stream_yields_chunks(self, mock_stream_client, mock_api_key):
+        from ai_writer import generate_draft_stream
+
+        template = get_template_by_name("memo")
+        chunks = list(generate_draft_stream(template, "Some notes", "Formal"))
+        assert chunks == ["Streamed ", "document ", "text."]
+        system = mock_stream_client.messages.stream.call_args.kwargs["system"]
+        assert template.system_prompt in system[0]["text"]
+
+    def test_generate_draft_stream_yields_validation_message(self, mock_stream_client, mock_api_key):
+        from ai_writer import StreamError, generate_draft_stream
+
+        chunks = list(generate_draft_stream(get_template_by_name("memo"), ""))
+        assert len(chunks) == 1
+        assert "notes" in chunks[0].lower()
+        assert isinstance(chunks[0], StreamError)
+        mock_stream_client.messages.stream.assert_not_called()
+
+    def test_refine_text_stream_yields_error_on_exception(self, mock_stream_client, mock_api_key):
+        from ai_writer import StreamError, refine_text_stream
+
+        mock_stream_client.messages.stream.side_effect = Exception("Network error")
+        chunks = list(refine_text_stream("Some text.", "Fix it"))
+        assert "error" in chunks[-1].lower()
+        assert isinstance(chunks[-1], StreamError)
+
+    def test_error_after_partial_text_is_marked(self, mock_stream_client, mock_api_key):
+        from ai_writer import StreamError, generate_draft_stream
+
+        def failing_stream():
+            yield "Partial "
+            raise Exception("Connection reset")
+
+        stream = mock_stream_client.messages.stream.return_value.__enter__.return_value
+        stream.text_stream = failing_stream()
+        chunks = list(generate_draft_stream(get_template_by_name("memo"), "Some notes"))
+        assert chunks[0] == "Partial "
+        assert not isinstance(chunks[0], StreamError)
+        assert isinstance(chunks[-1], StreamError)
+
+    def test_unchanged_text_is_not_an_error(self, mock_stream_client, mock_api_key):
+        from ai_writer import StreamError, refine_text_stream
+
+        chunks = list(refine_text_stream("Some text.", "  "))
+        assert chunks == ["Some text."]
+        assert not isinstance(chunks[0], StreamError)
+
+    def test_streamed_text_is_cached(self, mock_stream_client, mock_api_key, tmp_drafts_dir):
+        from ai_writer import refine_text_stream
+
+        with patch("ai_writer.RESPONSE_CACHE_ENABLED", True):
+            list(refine_text_stream("Some text.", "Fix it"))
+            chunks = list(refine_text_stream("Some text.", "Fix it"))
+        assert chunks == ["Streamed document text."]
+        assert mock_stream_client.messages.stream.call_count == 1
+
+
+class TestAsyncApi:
+    """Tests for generate_draft_async(), refine_text_async(), generate_many()."""
+
+    def test_generate_draft_async_returns_text(self, mock_async_client, mock_api_key):
+        from ai_writer import generate_draft_async
+
+        template = get_template_by_name("memo")
+        result = asyncio.run(generate_draft_async(template, "Some notes", "Formal"))
+        assert result == "Async document text."
+        system = mock_async_client.messages.create.call_args.kwargs["system"]
+        assert template.system_prompt in system[0]["text"]
+
+    def test_generate_draft_async_skips_api_for_empty_notes(self, mock_async_client, mock_api_key):
+        from ai_writer import generate_draft_async
+
+        asyncio.run(generate_draft_async(get_template_by_name("memo"), "  "))
+        mock_async_client.messages.create.assert_not_called()
+
+    def test_refine_text_async_returns_error_on_exception(self, mock_async_client, mock_api_key):
+        from ai_writer import refine_text_async
+
+        mock_async_client.messages.create.side_effect = Exception("Network error")
+        result = asyncio.run(refine_text_async("Some text.", "Fix it"))
+        assert "error" in result.lower()
+
+    def test_disk_caches_run_off_event_loop(self, mock_async_client, mock_api_key, tmp_drafts_dir):
+        from ai_writer import generate_draft_async
+
+        threads = []
+
+        def record(*args):
+            threads.append(threading.current_thread())
+
+        with (
+            patch("ai_writer.RESPONSE_CACHE_ENABLED", True),
+            patch("ai_writer.SEMANTIC_CACHE_ENABLED", True),
+            patch("ai_writer._cache_lookup", side_effect=record),
+            patch("ai_writer._cache_update", side_effect=record),
+            patch("semantic_cache.lookup", side_effect=record),
+            patch("semantic_cache.update", side_effect=record),
+        ):
+            asyncio.run(generate_draft_async(get_template_by_name("memo"), "Some notes"))
+        assert len(threads) == 4
+        assert threading.main_thread() not in threads
+
+    def test_generate_many_preserves_order(self, mock_async_client, mock_api_key):
+        from ai_writer import generate_many
+
+        template = get_template_by_name("general")
+        results = asyncio.run(generate_many([
+            (template, "First notes", "Formal"),
+            (template, "", "Formal"),
+            (template, "Third notes", "Casual"),
+        ]))
+        assert results[0] == "Async document text."
+        assert "notes" in results[1].lower()
+        assert results[2] == "Async document text."
+        assert mock_async_client.messages.create.await_count == 2
+
+
+class TestResponseCache:
+    """Tests for the opt-in on-disk response cache."""
+
+    @pytest.fixture
+    def cache_enabled(self, tmp_drafts_dir):
+        with patch("ai_writer.RESPONSE_CACHE_ENABLED", True):
+            yield tmp_drafts_dir / ".cache"
+
+    def test_identical_request_served_from_cache(self, mock_client, mock_api_key, cache_enabled):
+        from ai_writer import generate_draft
+
+        template = get_template_by_name("memo")
+        first = generate_draft(template, "Some notes", "Formal")
+        second = generate_draft(template, "  Some   notes ", "Formal")
+        assert first == second == "Generated document text."
+        assert mock_client.messages.create.call_count == 1
+        assert len(list(cache_enabled.glob("*.json"))) == 1
+
+    def test_different_line_structure_misses_cache(self, mock_client, mock_api_key, cache_enabled):
+        from ai_writer import refine_text
+
+        refine_text("SUMMARY\nRevenue up.\n- One\n- Two", "Make it shorter")
+        refine_text("SUMMARY Revenue up. - One - Two", "Make it shorter")
+        refine_text("SUMMARY\n\nRevenue up.\n- One\n- Two", "Make it shorter")
+        assert mock_client.messages.create.call_count == 3
+
+    def test_trailing_spaces_per_line_share_cache(self, mock_client, mock_api_key, cache_enabled):
+        from ai_writer import refine_text
+
+        refine_text("SUMMARY\nRevenue up.", "Make it shorter")
+        refine_text("SUMMARY  \nRevenue   up. ", "Make it shorter")
+        assert mock_client.messages.create.call_count == 1
+
+    def test_different_tone_misses_cache(self, mock_client, mock_api_key, cache_enabled):
+        from ai_writer import generate_draft
+
+        template = get_template_by_name("memo")
+        generate_draft(template, "Some notes", "Formal")
+        generate_draft(template, "Some notes", "Casual")
+        assert mock_client.messages.create.call_count == 2
+
+    def test_expired_entry_is_refetched(self, mock_client, mock_api_key, cache_enabled):
+        from ai_writer import refine_text
+
+        refine_text("Original text.", "Make it shorter")
+        with patch("ai_writer.RESPONSE_CACHE_TTL", -1):
+            refine_text("Original text.", "Make it shorter")
+        assert mock_client.messages.create.call_count == 2
+
+    def test_oldest_entries_pruned_past_cap(self, mock_client, mock_api_key, cache_enabled):
+        from ai_writer import refine_text
+
+        with patch("ai_writer.RESPONSE_CACHE_MAX_ENTRIES", 2):
+            for instruction in ("One", "Two", "Three"):
+                refine_text("Original text.", instruction)
+                time.sleep(0.01)  # Distinct mtimes
+        assert len(list(cache_enabled.glob("*.json"))) == 2
+
+    def test_expired_entries_pruned_on_update(self, mock_client, mock_api_key, cache_enabled):
+        from ai_writer import refine_text
+
+        refine_text("Original text.", "One")
+        stale = next(cache_enabled.glob("*.json"))
+        os.utime(stale, (0, 0))
+        refine_text("Original text.", "Two")
+        assert not stale.exists()
+        assert len(list(cache_enabled.glob("*.json"))) == 1
+
+    def test_no_temp_files_left(self, mock_client, mock_api_key, cache_enabled):
+        from ai_writer import refine_text
+
+        refine_text("Original text.", "One")
+        assert [p.suffix for p in cache_enabled.iterdir()] == [".json"]
+
+    def test_errors_are_not_cached(self, mock_client, mock_api_key, cache_enabled):
+        from ai_writer import refine_text
+
+        mock_client.messages.create.side_effect = Exception("Network error")
+        refine_text("Some text.", "Fix it")
+        assert not cache_enabled.exists() or not list(cache_enabled.glob("*.json"))
+
+    def test_disabled_by_default(self, mock_client, mock_api_key, tmp_drafts_dir):
+        from ai_writer import generate_draft
+
+        template = get_template_by_name("memo")
+        generate_draft(template, "Some notes")
+        generate_draft(template, "Some notes")
+        assert mock_client.messages.create.call_count == 2
+        assert not (tmp_drafts_dir / ".cache").exists()
+
+    def test_semantic_cache_reuses_near_duplicate_draft(self, mock_client, mock_api_key, tmp_drafts_dir):
+        from ai_writer import generate_draft
+
+        notes = "Recipient John Smith at ABC Corp, request a meeting to discuss Q2 results and revenue growth"
+        template = get_template_by_name("formal_letter")
+        with patch("ai_writer.SEMANTIC_CACHE_ENABLED", True):
+            generate_draft(template, notes, "Formal")
+            result = generate_draft(template, notes + ".", "Formal")
+        assert result == "Generated document text."
+        assert mock_client.messages.create.call_count == 1
+
+    def test_semantic_cache_misses_on_changed_amount(self, mock_client, mock_api_key, tmp_drafts_dir):
+        from ai_writer import generate_draft
+
+        notes = "Recipient John Smith at ABC Corp, invoice of 5000 dollars overdue since March, request payment"
+        template = get_template_by_name("formal_letter")
+        with patch("ai_writer.SEMANTIC_CACHE_ENABLED", True):
+            generate_draft(template, notes, "Formal")
+            generate_draft(template, notes.replace("5000", "50000"), "Formal")
+        assert mock_client.messages.create.call_count == 2
+
+
+class TestMessageBatches:
+    """Tests for submit_draft_batch() / get_batch_results()."""
+
+    def test_submits_one_request_per_draft(self, mock_client, mock_api_key):
+        from ai_writer import submit_draft_batch
+
+        mock_client.messages.batches.create.return_value.id = "msgbatch_1"
+        template = get_template_by_name("memo")
+        batch_id = submit_draft_batch({
+            "draft-0": (template, "First notes", "Formal"),
+            "draft-1": (template, "   ", "Formal"),  # Empty notes are skipped
+            "draft-2": (template, "Second notes", "Friendly"),
+        })
+
+        assert batch_id == "msgbatch_1"
+        requests = mock_client.messages.batches.create.call_args.kwargs["requests"]
+        assert [r["custom_id"] for r in requests] == ["draft-0", "draft-2"]
+        assert requests[0]["params"]["messages"][0]["content"].endswith("First notes")
+
+    def test_submit_without_api_key_returns_none(self, mock_client):
+        from ai_writer import submit_draft_batch
+
+        with patch("ai_writer.ANTHROPIC_API_KEY", ""):
+            template = get_template_by_name("memo")
+            assert submit_draft_batch({"draft-0": (template, "Notes", "Formal")}) is None
+        mock_client.messages.batches.create.assert_not_called()
+
+    def test_processing_status_while_in_progress(self, mock_client):
+        from ai_writer import get_batch_results
+
+        mock_client.messages.batches.retrieve.return_value.processing_status = "in_progress"
+        assert get_batch_results("msgbatch_1").status == "processing"
+        mock_client.messages.batches.results.assert_not_called()
+
+    def test_unknown_batch_fails_permanently(self, mock_client):
+        from ai_writer import get_batch_results
+
+        error = Exception("not_found_error")
+        error.status_code = 404
+        mock_client.messages.batches.retrieve.side_effect = error
+        results = get_batch_results("msgbatch_gone")
+        assert results.status == "failed"
+        assert "not_found_error" in results.error
+
+    def test_network_error_is_retryable(self, mock_client):
+        from ai_writer import get_batch_results
+
+        mock_client.messages.batches.retrieve.side_effect = ConnectionError("offline")
+        assert get_batch_results("msgbatch_1").status == "unavailable"
+
+    def test_rate_limit_is_retryable(self, mock_client):
+        from ai_writer import get_batch_results
+
+        error = Exception("rate_limit_error")
+        error.status_code = 429
+        mock_client.messages.batches.retrieve.side_effect = error
+        assert get_batch_results("msgbatch_1").status == "unavailable"
+
+    def test_results_mapped_by_custom_id(self, mock_client):
+        from ai_writer import get_batch_results
+
+        ok = MagicMock(custom_id="draft-0")
+        ok.result.type = "succeeded"
+        ok.result.message.content = [MagicMock(text=" Batch text. ")]
+        failed = MagicMock(custom_id="draft-1")
+        failed.result.type = "errored"
+        mock_client.messages.batches.retrieve.return_value.processing_status = "ended"
+        mock_client.messages.batches.results.return_value = iter([ok, failed])
+
+        results = get_batch_results("msgbatch_1")
+        assert results.status == "ended"
+        assert results.texts == {"draft-0": "Batch text."}
+        assert results.errors == {"draft-1": "request errored"}
+
+    def test_text_starting_with_error_is_a_result(self, mock_client):
+        from ai_writer import get_batch_results
+
+        ok = MagicMock(custom_id="draft-0")
+        ok.result.type = "succeeded"
+        ok.result.message.content = [MagicMock(text="Error report: Q3 outage")]
+        mock_client.messages.batches.retrieve.return_value.processing_status = "ended"
+        mock_client.messages.batches.results.return_value = iter([ok])
+
+        results = get_batch_results("msgbatch_1")
+        assert results.texts == {"draft-0": "Error report: Q3 outage"}
+        assert results.errors == {}
+
+
+def test_import_does_not_load_anthropic(imports_after):
+    assert "anthropic" not in imports_after("ai_writer")
@@ -1,10 +1,15 @@
 """Tests for draft_storage.py — file I/O with temporary directories."""
 
-import json
+import os
+import queue
+from pathlib import Path
+from unittest.mock import patch
 
+import orjson
 import pytest
 
-from draft_storage import Draft, save_draft, load_draft, list_drafts
+import draft_storage
+from draft_storage import INDEX_FILENAME, Draft, delete_draft, save_draft, load_draft, list_drafts
 
 
 @pytest.fixture
@@ -27,11 +32,11 @@ class TestSaveDraft:
         path = save_draft("My Title", "memo", "Formal", "notes", "text body")
         assert path is not None
         assert path.endswith(".json")
-        assert json.loads(open(path).read())
+        assert orjson.loads(Path(path).read_bytes())
 
     def test_json_has_correct_structure(self, tmp_drafts_dir):
         path = save_draft("My Title", "memo", "Formal", "notes", "text body")
-        data = json.loads(open(path).read())
+        data = orjson.loads(Path(path).read_bytes())
         assert data["title"] == "My Title"
         assert data["template_name"] == "memo"
         assert data["tone"] == "Formal"
@@ -48,6 +53,10 @@ class TestSaveDraft:
         assert "@" not in filename
         assert "#" not in filename
 
+    def test_keeps_unicode_letters_in_filename(self, tmp_drafts_dir):
+        path = save_draft("Café résumé!", "general", "Casual", "n", "t")
+        assert path.split("/")[-1].startswith("Café_résumé_")
+
     def test_sanitizes_long_titles(self, tmp_drafts_dir):
         long_title = "A" * 100
         path = save_draft(long_title, "general", "Casual", "n", "t")
@@ -90,10 +99,8 @@ class TestListDrafts:
         assert list_drafts() == []
 
     def test_returns_drafts_sorted_newest_first(self, tmp_drafts_dir):
-        import time
-
+        # saved_at has microsecond resolution, so no sleep is needed between saves
         save_draft("First", "general", "Casual", "n", "t")
-        time.sleep(0.05)
         save_draft("Second", "memo", "Formal", "n", "t")
 
         drafts = list_drafts()
@@ -101,6 +108,12 @@ class TestListDrafts:
         assert drafts[0]["title"] == "Second"
         assert drafts[1]["title"] == "First"
 
+    def test_sorted_by_save_time_not_title(self, tmp_drafts_dir):
+        save_draft("Beta", "general", "Casual", "n", "t")
+        save_draft("Alpha", "memo", "Formal", "n", "t")
+
+        assert [d["title"] for d in list_drafts()] == ["Alpha", "Beta"]
+
     def test_drafts_have_expected_keys(self, tmp_drafts_dir, saved_draft_path):
         drafts = list_drafts()
         assert len(drafts) == 1
@@ -119,6 +132,181 @@ class TestListDrafts:
         assert drafts[0]["title"] == "Test Draft"
 
 
+class TestDraftIndex:
+    """Tests for the list_drafts() metadata index."""
+
+    def test_save_writes_index(self, tmp_drafts_dir, saved_draft_path):
+        index = orjson.loads((tmp_drafts_dir / INDEX_FILENAME).read_bytes())
+        filename = saved_draft_path.split("/")[-1]
+        assert index[filename]["title"] == "Test Draft"
+
+    def test_list_served_from_index(self, tmp_drafts_dir, saved_draft_path):
+        list_drafts()
+        # Corrupting the draft body doesn't matter: metadata comes from the index
+        Path(saved_draft_path).write_text("not json!")
+        drafts = list_drafts()
+        assert len(drafts) == 1
+        assert drafts[0]["title"] == "Test Draft"
+
+    def test_index_not_listed_as_draft(self, tmp_drafts_dir, saved_draft_path):
+        filenames = [d["filename"] for d in list_drafts()]
+        assert INDEX_FILENAME not in filenames
+
+    def test_picks_up_files_added_outside_app(self, tmp_drafts_dir, saved_draft_path):
+        list_drafts()
+        (tmp_drafts_dir / "zz_external.json").write_bytes(orjson.dumps({"title": "External"}))
+        titles = [d["title"] for d in list_drafts()]
+        assert titles == ["Test Draft", "External"]  # No saved_at sorts last
+
+    def test_null_saved_at_sorts_last(self, tmp_drafts_dir, saved_draft_path):
+        (tmp_drafts_dir / "aa_null.json").write_bytes(orjson.dumps({"title": "Null", "saved_at": None}))
+        titles = [d["title"] for d in list_drafts()]
+        assert titles == ["Test Draft", "Null"]
+
+    def test_drops_removed_files(self, tmp_drafts_dir, saved_draft_path):
+        list_drafts()
+        assert delete_draft(saved_draft_path.split("/")[-1])
+        assert list_drafts() == []
+        assert orjson.loads((tmp_drafts_dir / INDEX_FILENAME).read_bytes()) == {}
+
+    def test_rebuilds_missing_index(self, tmp_drafts_dir, saved_draft_path):
+        (tmp_drafts_dir / INDEX_FILENAME).unlink()
+        assert [d["title"] for d in list_drafts()] == ["Test Draft"]
+        assert (tmp_drafts_dir / INDEX_FILENAME).exists()
+
+    def test_metadata_dotfiles_not_listed(self, tmp_drafts_dir, saved_draft_path):
+        (tmp_drafts_dir / ".sem_cache.json").write_text("[]")
+        assert [d["title"] for d in list_drafts()] == ["Test Draft"]
+        assert delete_draft(".sem_cache.json") is False
+
+    def test_index_cannot_be_deleted_as_draft(self, tmp_drafts_dir, saved_draft_path):
+        assert delete_draft(INDEX_FILENAME) is False
+        assert (tmp_drafts_dir / INDEX_FILENAME).exists()
+
+
+class TestListCache:
+    """Tests for reusing list_drafts() results while the folder is unchanged."""
+
+    def test_unchanged_folder_skips_index(self, tmp_drafts_dir, saved_draft_path, monkeypatch):
+        first = list_drafts()
+        monkeypatch.setattr("draft_storage._read_index", lambda: pytest.fail("index re-read"))
+        assert list_drafts() == first
+
+    def test_returned_list_is_a_copy(self, tmp_drafts_dir, saved_draft_path):
+        list_drafts().clear()
+        assert len(list_drafts()) == 1
+
+    def test_save_invalidates(self, tmp_drafts_dir, saved_draft_path):
+        list_drafts()
+        save_draft("Second", "general", "Professional", "", "")
+        assert len(list_drafts()) == 2
+
+    def test_external_add_invalidates(self, tmp_drafts_dir, saved_draft_path):
+        list_drafts()
+        (tmp_drafts_dir / "zz_external.json").write_bytes(orjson.dumps({"title": "External"}))
+        assert len(list_drafts()) == 2
+
+
+@pytest.fixture
+def write_behind(tmp_drafts_dir, monkeypatch):
+    """Enable write-behind saves with fresh writer state."""
+    monkeypatch.setattr("draft_storage.DRAFT_WRITE_BEHIND", True)
+    monkeypatch.setattr("draft_storage._pending", {})
+    monkeypatch.setattr("draft_storage._write_queue", queue.Queue())
+    monkeypatch.setattr("draft_storage._writer", None)
+    return tmp_drafts_dir
+
+
+class TestWriteBehind:
+    """Tests for AI_WRITER_WRITE_BEHIND background saves."""
+
+    def test_flush_writes_file_and_index(self, write_behind):
+        path = save_draft("Queued", "general", "Professional", "n", "Body")
+        draft_storage.flush_drafts()
+        assert orjson.loads(Path(path).read_bytes())["document_text"] == "Body"
+        index = orjson.loads((write_behind / INDEX_FILENAME).read_bytes())
+        assert index[path.split("/")[-1]]["title"] == "Queued"
+        assert draft_storage._pending == {}
+
+    def test_pending_save_visible_to_readers(self, write_behind, monkeypatch):
+        monkeypatch.setattr("draft_storage._writer", object())  # Writer never runs
+        path = save_draft("Pending", "general", "Professional", "n", "Body")
+        assert load_draft(path).document_text == "Body"
+        assert [d["title"] for d in list_drafts()] == ["Pending"]
+
+    def test_resave_of_pending_path_coalesces(self, write_behind, monkeypatch):
+        monkeypatch.setattr("draft_storage._writer", object())
+        path = write_behind / "Same_20260101_000000.json"
+        draft_storage._enqueue_write(path, b'{"v": 1}', {})
+        draft_storage._enqueue_write(path, b'{"v": 2}', {})
+        assert draft_storage._write_queue.qsize() == 1
+        assert draft_storage._pending[path][0] == b'{"v": 2}'
+
+    def test_resave_during_failed_write_is_retried(self, write_behind):
+        path = write_behind / "Same_20260101_000000.json"
+        real_replace = os.replace
+        calls = []
+
+        def flaky_replace(src, dst):
+            calls.append(dst)
+            if len(calls) == 1:
+                draft_storage._enqueue_write(path, b'{"v": 2}', {})  # Re-save mid-write
+                raise OSError("disk full")
+            real_replace(src, dst)
+
+        with patch("draft_storage.os.replace", flaky_replace):
+            draft_storage._enqueue_write(path, b'{"v": 1}', {})
+            draft_storage.flush_drafts()
+        assert path.read_bytes() == b'{"v": 2}'
+        assert draft_storage._pending == {}
+
+    def test_failed_write_dropped_when_not_resaved(self, write_behind):
+        path = write_behind / "Same_20260101_000000.json"
+        with patch("draft_storage.os.replace", side_effect=OSError("disk full")):
+            draft_storage._enqueue_write(path, b'{"v": 1}', {})
+            draft_storage.flush_drafts()
+        assert not path.exists()
+        assert draft_storage._pending == {}
+
+
+class TestSameTitle:
+    """Saves with the same title in the same second must not overwrite each other."""
+
+    def test_second_save_gets_new_file(self, tmp_drafts_dir, frozen_now):
+        first = save_draft("Memo", "memo", "Formal", "n", "First body")
+        second = save_draft("Memo", "memo", "Formal", "n", "Second body")
+        assert first != second
+        assert load_draft(first).document_text == "First body"
+        assert load_draft(second).document_text == "Second body"
+        assert len(list_drafts()) == 2
+
+    def test_pending_write_counts_as_taken(self, write_behind, monkeypatch, frozen_now):
+        monkeypatch.setattr("draft_storage._writer", object())  # Writer never runs
+        first = save_draft("Memo", "memo", "Formal", "n", "First body")
+        second = save_draft("Memo", "memo", "Formal", "n", "Second body")
+        assert first != second
+
+
+class TestPendingBatches:
+    """Tests for the pending Message Batch list."""
+
+    DRAFTS = {"draft-0": {"title": "Memo", "template_name": "memo", "tone": "Formal", "notes": "n"}}
+
+    def test_empty_without_file(self, tmp_drafts_dir):
+        assert draft_storage.load_pending_batches() == {}
+
+    def test_add_and_remove(self, tmp_drafts_dir):
+        draft_storage.add_pending_batch("msgbatch_1", self.DRAFTS)
+        draft_storage.add_pending_batch("msgbatch_2", {})
+        assert draft_storage.load_pending_batches() == {"msgbatch_1": self.DRAFTS, "msgbatch_2": {}}
+        draft_storage.remove_pending_batch("msgbatch_1")
+        assert draft_storage.load_pending_batches() == {"msgbatch_2": {}}
+
+    def test_not_listed_as_draft(self, tmp_drafts_dir):
+        draft_storage.add_pending_batch("msgbatch_1", self.DRAFTS)
+        assert list_drafts() == []
+
+
 class TestRoundTrip:
     """Save then load preserves all fields."""
 
@@ -137,3 +325,12 @@ class TestRoundTrip:
         assert draft.notes == "test notes here"
         assert draft.document_text == "Full document text content."
         assert draft.saved_at  # Non-empty timestamp
+
+    def test_round_trip_preserves_unicode(self, tmp_drafts_dir):
+        path = save_draft("Café — résumé", "general", "Friendly", "naïve ✓", "Grüße, 你好")
+        raw = Path(path).read_text(encoding="utf-8")
+        assert "你好" in raw  # Stored as UTF-8, not \u escapes
+        draft = load_draft(path)
+        assert draft.title == "Café — résumé"
+        assert draft.notes == "naïve ✓"
+        assert draft.document_text == "Grüße, 你好"
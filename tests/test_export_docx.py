@@ -1,11 +1,21 @@
-"""Tests for export_docx.py — DOCX generation with real python-docx."""
+"""Tests for export_docx.py — DOCX generation with real python-docx.
 
+Document structure is checked on in-memory output from render_docx();
+export_to_docx() tests cover the file handling.
+"""
+
+from io import BytesIO
 from pathlib import Path
 
 import pytest
 from docx import Document
 
-from export_docx import export_to_docx
+from export_docx import export_to_docx, render_docx
+
+
+def _render(text: str, title: str = "Test") -> Document:
+    """Render to bytes and parse the result back without touching disk."""
+    return Document(BytesIO(render_docx(text, title=title)))
 
 
 class TestExportToDocx:
@@ -28,6 +38,11 @@ class TestExportToDocx:
         assert path == custom
         assert Path(custom).exists()
 
+    def test_output_dir_gets_generated_filename(self, tmp_drafts_dir, sample_document_text):
+        path = export_to_docx(sample_document_text, title="Report", output_dir=tmp_drafts_dir / "sub")
+        assert Path(path).parent == tmp_drafts_dir / "sub"
+        assert Path(path).name.startswith("Report_")
+
     def test_auto_generates_filename_with_sanitized_title(self, tmp_drafts_dir):
         path = export_to_docx("Some content here.", title="My Report!")
         filename = Path(path).name
@@ -41,34 +56,27 @@ class TestExportToDocx:
         title_part = filename.split("_2")[0]  # Before timestamp
         assert len(title_part) <= 30
 
-    def test_contains_title_heading(self, tmp_drafts_dir, sample_document_text):
-        path = export_to_docx(sample_document_text, title="My Report Title")
-        doc = Document(path)
+    def test_contains_title_heading(self, sample_document_text):
+        doc = _render(sample_document_text, title="My Report Title")
         # First paragraph should be a heading with the title
         first = doc.paragraphs[0]
         assert first.text == "My Report Title"
         assert first.style.name in ("Title", "Heading 0") or first.style.name.startswith("Heading")
 
-    def test_all_caps_become_headings(self, tmp_drafts_dir):
-        text = "EXECUTIVE SUMMARY\n\nThis is the summary.\n"
-        path = export_to_docx(text, title="Test")
-        doc = Document(path)
+    def test_all_caps_become_headings(self):
+        doc = _render("EXECUTIVE SUMMARY\n\nThis is the summary.\n")
         # Find the ALL CAPS line — it should be a heading (title-cased)
         heading_texts = [p.text for p in doc.paragraphs if p.style.name.startswith("Heading")]
         assert "Executive Summary" in heading_texts
 
-    def test_bullets_preserved(self, tmp_drafts_dir):
-        text = "Items:\n- First item\n- Second item\n* Third item\n"
-        path = export_to_docx(text, title="Test")
-        doc = Document(path)
+    def test_bullets_preserved(self):
+        doc = _render("Items:\n- First item\n- Second item\n* Third item\n")
         bullet_paras = [p for p in doc.paragraphs if p.style.name == "List Bullet"]
         assert len(bullet_paras) == 3
         assert bullet_paras[0].text == "First item"
 
-    def test_numbered_items_preserved(self, tmp_drafts_dir):
-        text = "Steps:\n1. Do this\n2) Do that\n"
-        path = export_to_docx(text, title="Test")
-        doc = Document(path)
+    def test_numbered_items_preserved(self):
+        doc = _render("Steps:\n1. Do this\n2) Do that\n")
         numbered_paras = [p for p in doc.paragraphs if p.style.name == "List Number"]
         assert len(numbered_paras) == 2
 
@@ -82,3 +90,19 @@ class TestExportToDocx:
         nested = tmp_path / "a" / "b" / "c" / "test.docx"
         path = export_to_docx(sample_document_text, output_path=str(nested))
         assert Path(path).exists()
+
+    def test_headings_use_heading_styles(self):
+        doc = _render("SECTION ONE\nDetails:\nBody text.\n")
+        styles = {p.text: p.style.name for p in doc.paragraphs}
+        assert styles["Section One"] == "Heading 1"
+        assert styles["Details:"] == "Heading 2"
+        assert styles["Body text."] == "Normal"
+
+    def test_numbered_marker_stripped(self):
+        doc = _render("1. Do this\n12) Do that\n")
+        numbered = [p.text for p in doc.paragraphs if p.style.name == "List Number"]
+        assert numbered == ["Do this", "Do that"]
+
+
+def test_import_does_not_load_docx(imports_after):
+    assert "docx" not in imports_after("export_docx")
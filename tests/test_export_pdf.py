@@ -1,10 +1,14 @@
-"""Tests for export_pdf.py — PDF generation with real fpdf2."""
+"""Tests for export_pdf.py — PDF generation with real fpdf2.
+
+Rendering is checked on in-memory output from render_pdf(); export_to_pdf()
+tests cover the file handling.
+"""
 
 from pathlib import Path
 
 import pytest
 
-from export_pdf import export_to_pdf, DocumentPDF
+from export_pdf import export_to_pdf, render_pdf, DocumentPDF
 
 
 class TestExportToPdf:
@@ -27,6 +31,11 @@ class TestExportToPdf:
         assert path == custom
         assert Path(custom).exists()
 
+    def test_output_dir_gets_generated_filename(self, tmp_drafts_dir, sample_document_text):
+        path = export_to_pdf(sample_document_text, title="Report", output_dir=tmp_drafts_dir / "sub")
+        assert Path(path).parent == tmp_drafts_dir / "sub"
+        assert Path(path).name.startswith("Report_")
+
     def test_auto_generates_filename_with_sanitized_title(self, tmp_drafts_dir):
         path = export_to_pdf("Some content here.", title="My Report!")
         filename = Path(path).name
@@ -52,11 +61,16 @@ class TestExportToPdf:
         path = export_to_pdf(sample_document_text, output_path=str(nested))
         assert Path(path).exists()
 
+    def test_recreates_missing_drafts_dir(self, tmp_drafts_dir, sample_document_text):
+        tmp_drafts_dir.rmdir()
+        path = export_to_pdf(sample_document_text, title="Recreated")
+        assert Path(path).exists()
+
 
 class TestDocumentPDF:
     """Tests for DocumentPDF class."""
 
-    def test_header_footer_no_crash(self, tmp_drafts_dir):
+    def test_header_footer_no_crash(self):
         """Multi-page document should render header/footer without errors."""
         # Use short lines separated by blanks to force clean page breaks
         paragraphs = []
@@ -64,10 +78,49 @@ class TestDocumentPDF:
             paragraphs.append(f"Paragraph {i} text.")
             paragraphs.append("")
         long_text = "\n".join(paragraphs)
-        path = export_to_pdf(long_text, title="Multi Page")
-        assert path is not None
-        assert Path(path).exists()
+        data = render_pdf(long_text, title="Multi Page")
+        assert data.startswith(b"%PDF-")
+        assert b"/Count 1 " not in data  # Really spans several pages
 
     def test_document_pdf_sets_title(self):
         pdf = DocumentPDF(title="My Title")
         assert pdf.doc_title == "My Title"
+
+    def test_font_lookup_is_cached(self, monkeypatch):
+        from export_pdf import _get_font_files
+
+        _get_font_files()
+        calls = []
+        monkeypatch.setattr("export_pdf.os.path.exists", lambda p: calls.append(p) or False)
+        DocumentPDF(title="Cached fonts")
+        assert calls == []
+
+    def test_fallback_styles_reuse_regular_font(self, monkeypatch):
+        from export_pdf import _get_font_files
+
+        font_files = _get_font_files()
+        if not font_files:
+            pytest.skip("No Unicode font installed")
+        regular = font_files[0]
+        monkeypatch.setattr("export_pdf._get_font_files", lambda: (regular, regular, regular))
+        pdf = DocumentPDF(title="One face")
+        assert list(pdf.fonts) == ["unisans"]
+        pdf.add_page()
+        pdf.set_font(pdf.font_name, "B", 12)
+        pdf.set_font(pdf.font_name, "I", 8)
+        assert pdf.font_style == ""
+
+    def test_consecutive_lines_without_blank_separator(self):
+        """Each line must start back at the left margin (fpdf2 leaves x at the right)."""
+        text = "Dear Sir,\nI am writing to you.\n- point one\nMore text after a bullet.\n1. Step\nDone."
+        assert render_pdf(text, title="Letter").startswith(b"%PDF-")
+
+    def test_header_date_computed_once(self):
+        from datetime import datetime
+
+        pdf = DocumentPDF(title="Dated")
+        assert pdf.date_str == datetime.now().strftime("%B %d, %Y")
+
+
+def test_import_does_not_load_fpdf(imports_after):
+    assert "fpdf" not in imports_after("export_pdf")
@@ -0,0 +1,55 @@
+"""Tests for main_app.py — import-time behavior and handlers called on a stub (no display needed)."""
+
+from unittest.mock import MagicMock, patch
+
+from ai_writer import BatchResults
+from draft_storage import list_drafts
+
+
+def test_import_defers_backend_modules(imports_after):
+    loaded = imports_after("main_app")
+    for module in ("ai_writer", "draft_storage", "export_pdf", "export_docx", "pydantic"):
+        assert module not in loaded
+
+
+class TestBatchResults:
+    """Tests for DocumentWriterApp._on_batch_results() with a stub app."""
+
+    DRAFT = {"title": "Memo", "template_name": "memo", "tone": "Formal", "notes": "n"}
+
+    def test_same_title_results_both_saved(self, tmp_drafts_dir, frozen_now):
+        from main_app import DocumentWriterApp
+
+        app = MagicMock()
+        results = BatchResults("ended", {"draft-0": "First", "draft-1": "Second"})
+        with patch("main_app.messagebox"):
+            DocumentWriterApp._on_batch_results(
+                app, "msgbatch_1", {"draft-0": self.DRAFT, "draft-1": self.DRAFT}, results,
+            )
+        assert len(list_drafts()) == 2
+        app._set_status.assert_called_with("Batch complete: 2 of 2 drafts saved")
+
+
+class TestBatchWorkers:
+    """Tests for the batch worker error paths with a stub app."""
+
+    @staticmethod
+    def _app():
+        app = MagicMock()
+        app._executor.submit.side_effect = lambda fn: fn()  # Run workers inline
+        return app
+
+    def test_check_failure_is_posted(self):
+        from main_app import DocumentWriterApp
+
+        app = self._app()
+        with patch("ai_writer.get_batch_results", side_effect=OSError("offline")):
+            DocumentWriterApp._check_batch(app, "msgbatch_1", {})
+        app._post_result.assert_called_once_with("batch_check_failed", ("msgbatch_1", {}, "offline"))
+
+    def test_check_failure_keeps_polling(self):
+        from main_app import BATCH_POLL_MS, DocumentWriterApp
+
+        app = self._app()
+        DocumentWriterApp._on_batch_check_failed(app, "msgbatch_1", {}, "offline")
+        app.root.after.assert_called_once_with(BATCH_POLL_MS, app._check_batch, "msgbatch_1", {})
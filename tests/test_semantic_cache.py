@@ -0,0 +1,104 @@
+"""Tests for semantic_cache.py — near-duplicate lookup with temporary directories."""
+
+import semantic_cache
+from semantic_cache import bucket_key, embed, facts, lookup, similarity, update
+
+
+class TestSimilarity:
+    """Tests for embed() and similarity()."""
+
+    def test_identical_text_scores_one(self):
+        v = embed("Revenue up 15%, new product launch")
+        assert abs(similarity(v, v) - 1.0) < 1e-9
+
+    def test_case_and_punctuation_ignored(self):
+        assert abs(similarity(embed("Hello, World!"), embed("hello world")) - 1.0) < 1e-9
+
+    def test_unrelated_text_scores_zero(self):
+        assert similarity(embed("apples oranges"), embed("meeting tuesday")) == 0.0
+
+    def test_empty_text_embeds_empty(self):
+        assert embed("  ...  ") == {}
+
+
+class TestFacts:
+    """Tests for facts()."""
+
+    def test_numbers_names_and_negations(self):
+        assert facts("Pay John $5,000 by May 3, not later") == ["3", "5,000", "John", "May", "Pay", "not"]
+
+    def test_contractions_count_as_negations(self):
+        assert facts("it isn't safe") == ["n't"]
+
+    def test_plain_words_ignored(self):
+        assert facts("meeting moved to the afternoon") == []
+
+
+class TestLookup:
+    """Tests for lookup() / update()."""
+
+    NOTES = (
+        "To: City Council. Re: Pothole on Main Street. It has been there three months "
+        "and is dangerous for cyclists and drivers heading downtown every morning."
+    )
+
+    def test_near_duplicate_hits(self, tmp_drafts_dir):
+        bucket = bucket_key("model", "prompt", "Formal")
+        update(bucket, self.NOTES, "Cached letter")
+        assert lookup(bucket, self.NOTES + " thanks") == "Cached letter"
+
+    def test_changed_number_misses(self, tmp_drafts_dir):
+        bucket = bucket_key("model", "prompt", "Formal")
+        update(bucket, self.NOTES + " Cost 5000.", "Cached letter")
+        assert lookup(bucket, self.NOTES + " Cost 50000.") is None
+
+    def test_changed_name_misses(self, tmp_drafts_dir):
+        bucket = bucket_key("model", "prompt", "Formal")
+        update(bucket, self.NOTES + " Signed John.", "Cached letter")
+        assert lookup(bucket, self.NOTES + " Signed Jane.") is None
+
+    def test_added_negation_misses(self, tmp_drafts_dir):
+        bucket = bucket_key("model", "prompt", "Formal")
+        update(bucket, self.NOTES, "Cached letter")
+        assert lookup(bucket, self.NOTES.replace("is dangerous", "is not dangerous")) is None
+
+    def test_different_notes_miss(self, tmp_drafts_dir):
+        bucket = bucket_key("model", "prompt", "Formal")
+        update(bucket, self.NOTES, "Cached letter")
+        assert lookup(bucket, "Thank Dr. Martinez for excellent care") is None
+
+    def test_other_bucket_misses(self, tmp_drafts_dir):
+        update(bucket_key("model", "prompt", "Formal"), self.NOTES, "Cached letter")
+        assert lookup(bucket_key("model", "prompt", "Casual"), self.NOTES) is None
+        assert lookup(bucket_key("model", "edited prompt", "Formal"), self.NOTES) is None
+        assert lookup(bucket_key("other model", "prompt", "Formal"), self.NOTES) is None
+
+    def test_persists_to_disk(self, tmp_drafts_dir):
+        bucket = bucket_key("model", "prompt", "Formal")
+        update(bucket, self.NOTES, "Cached letter")
+        assert (tmp_drafts_dir / ".sem_cache.json").exists()
+        semantic_cache.clear()
+        assert lookup(bucket, self.NOTES) == "Cached letter"
+
+    def test_failed_write_keeps_previous_file(self, tmp_drafts_dir, monkeypatch):
+        bucket = bucket_key("model", "prompt", "Formal")
+        update(bucket, self.NOTES, "Cached letter")
+        before = (tmp_drafts_dir / ".sem_cache.json").read_bytes()
+
+        def crash(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("semantic_cache.os.replace", crash)
+        update(bucket, "Completely different notes about a memo", "Second")
+        assert (tmp_drafts_dir / ".sem_cache.json").read_bytes() == before
+
+    def test_no_temp_files_left(self, tmp_drafts_dir):
+        update(bucket_key("model", "prompt", "Formal"), self.NOTES, "Cached letter")
+        assert [p.name for p in tmp_drafts_dir.iterdir()] == [".sem_cache.json"]
+
+    def test_evicts_oldest_past_cap(self, tmp_drafts_dir, monkeypatch):
+        monkeypatch.setattr("semantic_cache.SEMANTIC_CACHE_MAX_ENTRIES", 1)
+        bucket = bucket_key("model", "prompt", "Formal")
+        update(bucket, self.NOTES, "First")
+        update(bucket, "Completely different notes about a memo", "Second")
+        assert lookup(bucket, self.NOTES) is None
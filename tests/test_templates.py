@@ -1,6 +1,12 @@
 """Tests for templates.py — pure data, no mocks needed."""
 
-from templates import TEMPLATES, TONE_OPTIONS, DocumentTemplate, get_template_by_name
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from templates import (
+    TEMPLATE_INDEX_BY_NAME, TEMPLATES, TONE_OPTIONS, DocumentTemplate, get_template_by_name,
+)
 
 
 class TestGetTemplateByName:
@@ -19,9 +25,13 @@ class TestGetTemplateByName:
         result = get_template_by_name("")
         assert result.name == "general"
 
+    def test_index_lookup_matches_position(self):
+        for i, template in enumerate(TEMPLATES):
+            assert TEMPLATE_INDEX_BY_NAME[template.name] == i
+
 
 class TestTemplates:
-    """Tests for TEMPLATES list and DocumentTemplate fields."""
+    """Tests for TEMPLATES and DocumentTemplate fields."""
 
     def test_eight_templates_defined(self):
         assert len(TEMPLATES) == 8
@@ -42,6 +52,11 @@ class TestTemplates:
     def test_general_template_is_last(self):
         assert TEMPLATES[-1].name == "general"
 
+    def test_templates_are_immutable(self):
+        assert isinstance(TEMPLATES, tuple)
+        with pytest.raises(FrozenInstanceError):
+            TEMPLATES[0].name = "changed"
+
 
 class TestToneOptions:
     """Tests for TONE_OPTIONS."""
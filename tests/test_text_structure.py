@@ -0,0 +1,48 @@
+"""Tests for text_structure.py — pure functions, no fixtures needed."""
+
+from text_structure import (
+    BULLET, HEADING, NUMBERED, PARAGRAPH, SUBHEADING, classify_line,
+)
+
+
+class TestClassifyLine:
+    """Tests for classify_line()."""
+
+    def test_all_caps_is_heading(self):
+        assert classify_line("EXECUTIVE SUMMARY") == HEADING
+
+    def test_short_all_caps_is_paragraph(self):
+        assert classify_line("USA") == PARAGRAPH
+
+    def test_long_all_caps_is_paragraph(self):
+        assert classify_line("A" * 80) == PARAGRAPH
+
+    def test_colon_suffix_is_subheading(self):
+        assert classify_line("Action items:") == SUBHEADING
+
+    def test_long_colon_line_is_paragraph(self):
+        assert classify_line("x" * 60 + ":") == PARAGRAPH
+
+    def test_bullets(self):
+        assert classify_line("- First item") == BULLET
+        assert classify_line("* Second item") == BULLET
+
+    def test_dash_without_space_is_paragraph(self):
+        assert classify_line("-5 degrees outside") == PARAGRAPH
+
+    def test_numbered_items(self):
+        assert classify_line("1. Do this") == NUMBERED
+        assert classify_line("12) Do that") == NUMBERED
+
+    def test_number_without_separator_is_paragraph(self):
+        assert classify_line("2024 was a good year") == PARAGRAPH
+
+    def test_single_character_lines(self):
+        assert classify_line("-") == PARAGRAPH
+        assert classify_line(":") == SUBHEADING
+
+    def test_heading_takes_precedence_over_bullet(self):
+        assert classify_line("- ALL CAPS BULLET") == HEADING
+
+    def test_subheading_takes_precedence_over_bullet(self):
+        assert classify_line("- Items:") == SUBHEADING
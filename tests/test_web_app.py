@@ -0,0 +1,406 @@
+"""Tests for web_app.py helpers — no server needed."""
+
+import asyncio
+import os
+import socket
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import anyio.to_thread
+import pytest
+from limits import parse
+
+from config import WEB_THREAD_LIMIT
+from export_pdf import export_to_pdf
+from templates import TEMPLATES
+import web_app
+from web_app import (
+    MAX_BODY_BYTES, BodySizeLimitMiddleware, CompressionMiddleware, app, bind_available_port,
+    download_file, generate, get_external_ip, lifespan, limiter, rate_limit_handler, require_auth,
+    tpl, validate_lengths,
+)
+
+
+class TestLoadDraftFragment:
+    """Tests for fragments/load_draft.html, the /load response."""
+
+    @staticmethod
+    def _render(document_text="Body", **state):
+        state = {"template_name": "general", "tone": "Professional", "notes": "", **state}
+        return tpl.get_template("fragments/load_draft.html").render(
+            document_text=document_text, state=state,
+        )
+
+    def test_state_passed_as_json(self):
+        html = self._render(notes='line1\nline2 "quoted"')
+        assert '"notes": "line1\\nline2 \\"quoted\\""' in html
+        assert '"template_name": "general"' in html
+
+    def test_script_breakout_escaped(self):
+        html = self._render(notes="</script><script>alert(1)</script>", tone="</script>")
+        assert html.count("</script>") == 1
+
+    def test_document_text_escaped(self):
+        html = self._render(document_text="</textarea><script>x</script>")
+        assert "&lt;/textarea&gt;" in html
+        assert html.count("</textarea>") == 1
+
+
+class TestLifespan:
+    """Tests for the app lifespan hook."""
+
+    @staticmethod
+    def _run():
+        async def run():
+            async with lifespan(app):
+                return anyio.to_thread.current_default_thread_limiter().total_tokens
+
+        return asyncio.run(run())
+
+    def test_sizes_default_thread_limiter(self, web_drafts_dir):
+        with patch("web_app.prepare_client"):
+            assert self._run() == WEB_THREAD_LIMIT
+
+    def test_prepares_api_client(self, web_drafts_dir):
+        with patch("web_app.prepare_client") as prepare:
+            self._run()
+        prepare.assert_called_once()
+
+    def test_sweeps_stale_exports(self, web_drafts_dir):
+        with patch("web_app.prepare_client"), patch("web_app._sweep_exports") as sweep:
+            self._run()
+        sweep.assert_called_once()
+
+
+class TestTemplates:
+    """Tests for the Jinja2 environment."""
+
+    def test_fragments_autoescape(self):
+        html = tpl.get_template("fragments/document_result.html").render(
+            document_text="<script>x</script>", error=None,
+        )
+        assert "<script>x" not in html
+        assert "&lt;script&gt;x" in html
+
+    def test_no_reload_check(self):
+        assert tpl.env.auto_reload is False
+
+    def test_fragments_compiled_at_import(self):
+        cached = {name for _, name in tpl.env.cache}
+        assert "fragments/draft_list.html" in cached
+
+    def test_index_prerendered_with_every_template(self):
+        html = web_app._INDEX_HTML.decode()
+        for template in TEMPLATES:
+            assert f'data-name="{template.name}"' in html
+
+    def test_login_failure_page_shows_error(self):
+        assert b"Incorrect password" in web_app._LOGIN_FAILED_HTML
+        assert b"Incorrect password" not in web_app._LOGIN_HTML
+
+
+@pytest.fixture
+def busy_port():
+    """A port with a listener on it."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("0.0.0.0", 0))
+        s.listen()
+        yield s.getsockname()[1]
+
+
+class TestBindAvailablePort:
+    """Tests for bind_available_port()."""
+
+    def test_skips_port_in_use(self, busy_port):
+        with bind_available_port(busy_port, max_attempts=10) as s:
+            port = s.getsockname()[1]
+        assert busy_port < port < busy_port + 10
+
+    def test_returns_bound_socket(self, busy_port):
+        with bind_available_port(busy_port + 1, max_attempts=10) as s:
+            with pytest.raises(OSError), socket.socket() as other:
+                other.bind(("0.0.0.0", s.getsockname()[1]))
+
+    def test_raises_when_range_exhausted(self, busy_port):
+        with pytest.raises(RuntimeError):
+            bind_available_port(busy_port, max_attempts=1)
+
+
+class TestGetExternalIp:
+    """Tests for get_external_ip() with both lookups patched."""
+
+    def test_fast_answer_not_held_up_by_slow_lookup(self):
+        def slow():
+            time.sleep(1)
+            return "1.1.1.1"
+
+        start = time.monotonic()
+        with (
+            patch("web_app._gcp_external_ip", slow),
+            patch("web_app._ipify_external_ip", return_value="2.2.2.2"),
+        ):
+            assert get_external_ip() == "2.2.2.2"
+        assert time.monotonic() - start < 0.5
+
+    def test_skips_failed_lookup(self):
+        with (
+            patch("web_app._gcp_external_ip", side_effect=OSError("timeout")),
+            patch("web_app._ipify_external_ip", return_value="2.2.2.2"),
+        ):
+            assert get_external_ip() == "2.2.2.2"
+
+    def test_returns_none_when_all_fail(self):
+        with (
+            patch("web_app._gcp_external_ip", return_value=""),
+            patch("web_app._ipify_external_ip", side_effect=OSError("offline")),
+        ):
+            assert get_external_ip() is None
+
+
+@pytest.fixture
+def auth_required(monkeypatch):
+    """Behave as if WEB_PASSWORD were set."""
+    monkeypatch.setattr("web_app._AUTH_REQUIRED", True)
+
+
+def _request(**session):
+    return SimpleNamespace(session=session)
+
+
+class TestRequireAuth:
+    """Tests for require_auth() against a bare session dict."""
+
+    def test_open_access_without_password(self, monkeypatch):
+        monkeypatch.setattr("web_app._AUTH_REQUIRED", False)
+        assert require_auth(_request()) is None
+
+    def test_redirects_when_not_logged_in(self, auth_required):
+        response = require_auth(_request())
+        assert response.status_code == 303
+        assert response.headers["location"] == "/login"
+
+    def test_refreshes_active_session(self, auth_required, monkeypatch):
+        monkeypatch.setattr("web_app.WEB_SESSION_TIMEOUT", 100)
+        request = _request(authenticated=True, last_active=time.time() - 20)
+        assert require_auth(request) is None
+        assert time.time() - request.session["last_active"] < 1
+
+    def test_recent_activity_not_rewritten(self, auth_required, monkeypatch):
+        monkeypatch.setattr("web_app.WEB_SESSION_TIMEOUT", 100)
+        last_active = time.time() - 5
+        request = _request(authenticated=True, last_active=last_active)
+        assert require_auth(request) is None
+        assert request.session["last_active"] == last_active
+
+    def test_expired_session_cleared(self, auth_required, monkeypatch):
+        monkeypatch.setattr("web_app.WEB_SESSION_TIMEOUT", 60)
+        request = _request(authenticated=True, last_active=time.time() - 61)
+        assert require_auth(request).status_code == 303
+        assert request.session == {}
+
+
+@pytest.fixture
+def web_drafts_dir(tmp_drafts_dir, monkeypatch):
+    """tmp_drafts_dir as seen by web_app, with auth off."""
+    monkeypatch.setattr("web_app.DRAFTS_DIR", tmp_drafts_dir)
+    monkeypatch.setattr("web_app._AUTH_REQUIRED", False)
+    return tmp_drafts_dir
+
+
+@pytest.fixture
+def web_exports_dir(web_drafts_dir):
+    """The web exports folder under web_drafts_dir."""
+    exports = web_drafts_dir / web_app._EXPORTS_DIRNAME
+    exports.mkdir()
+    return exports
+
+
+class TestDownload:
+    """Tests for the /download handler, called directly."""
+
+    def test_web_export_deleted_after_send(self, web_exports_dir):
+        path = web_exports_dir / "report.pdf"
+        path.write_bytes(b"%PDF-1.4")
+        request = _request(exports=["report.pdf"])
+
+        response = asyncio.run(download_file(request, "report.pdf"))
+        assert response.media_type == "application/pdf"
+        assert response.chunk_size == 1024 * 1024
+        assert path.exists()
+        asyncio.run(response.background())
+        assert not path.exists()
+        assert request.session["exports"] == []
+
+    def test_other_sessions_export_kept(self, web_exports_dir):
+        path = web_exports_dir / "theirs.pdf"
+        path.write_bytes(b"%PDF-1.4")
+
+        response = asyncio.run(download_file(_request(), "theirs.pdf"))
+        assert response.background is None
+        assert path.exists()
+
+    def test_drafts_folder_not_served(self, web_exports_dir, web_drafts_dir):
+        (web_drafts_dir / "desktop.pdf").write_bytes(b"%PDF-1.4")
+        response = asyncio.run(download_file(_request(), "desktop.pdf"))
+        assert response.status_code == 404
+
+    def test_docx_media_type(self, web_exports_dir):
+        (web_exports_dir / "report.docx").write_bytes(b"PK")
+        response = asyncio.run(download_file(_request(), "report.docx"))
+        assert response.media_type.endswith("wordprocessingml.document")
+
+    def test_symlink_refused(self, web_exports_dir, tmp_path):
+        secret = tmp_path / "secret.txt"
+        secret.write_text("secret")
+        (web_exports_dir / "link.pdf").symlink_to(secret)
+        response = asyncio.run(download_file(_request(), "link.pdf"))
+        assert response.status_code == 404
+
+    def test_directory_refused(self, web_exports_dir):
+        response = asyncio.run(download_file(_request(), ".."))
+        assert response.status_code == 404
+
+    def test_missing_file_is_404(self, web_drafts_dir):
+        response = asyncio.run(download_file(_request(), "../missing.pdf"))
+        assert response.status_code == 404
+
+
+class TestStaticFiles:
+    """Tests for versioned static URLs."""
+
+    @staticmethod
+    def _cache_control(query_string: bytes):
+        static = app.routes[[r.name for r in app.routes].index("static")].app
+        path = web_app.BASE_DIR / "static" / "style.css"
+        scope = {"type": "http", "method": "GET", "headers": [], "query_string": query_string}
+        response = static.file_response(path, path.stat(), scope)
+        return response.headers.get("cache-control")
+
+    def test_pages_use_versioned_url(self):
+        url = web_app.static_url("style.css")
+        assert url.startswith("/static/style.css?v=")
+        assert url.encode() in web_app._INDEX_HTML
+
+    def test_versioned_url_immutable(self):
+        assert "immutable" in self._cache_control(b"v=abcd1234")
+
+    def test_unversioned_url_revalidates(self):
+        assert self._cache_control(b"") is None
+
+
+class TestGenerate:
+    """Tests for the /generate handler, called directly."""
+
+    def test_unknown_template_rejected_before_api_call(self, monkeypatch):
+        monkeypatch.setattr("web_app._AUTH_REQUIRED", False)
+        with patch("web_app.generate_draft_async") as generate_draft:
+            response = asyncio.run(generate.__wrapped__(_request(), "no-such-template", "notes"))
+        assert response.status_code == 400
+        assert b"Unknown template" in response.body
+        generate_draft.assert_not_called()
+
+
+class TestRateLimitHandler:
+    """Tests for the 429 handler."""
+
+    def test_retry_after_until_window_resets(self):
+        item = parse("1/minute")
+        args = ["test-key", f"retry-after-{time.time()}"]
+        limiter.limiter.hit(item, *args)
+        request = SimpleNamespace(state=SimpleNamespace(view_rate_limit=(item, args)))
+
+        response = asyncio.run(rate_limit_handler(request, None))
+        assert response.status_code == 429
+        assert 1 <= int(response.headers["retry-after"]) <= 61
+
+
+class TestExportSweep:
+    """Tests for the web exports folder and its sweep."""
+
+    def test_export_written_to_exports_folder(self, web_drafts_dir):
+        filepath = web_app._export(export_to_pdf, "Body text.", "Report")
+        assert Path(filepath).parent == web_drafts_dir / web_app._EXPORTS_DIRNAME
+
+    def test_stale_exports_swept(self, web_exports_dir):
+        stale = web_exports_dir / "stale.pdf"
+        fresh = web_exports_dir / "fresh.pdf"
+        stale.write_bytes(b"%PDF-1.4")
+        fresh.write_bytes(b"%PDF-1.4")
+        old = time.time() - web_app.WEB_EXPORT_MAX_AGE - 60
+        os.utime(stale, (old, old))
+
+        web_app._sweep_exports()
+        assert not stale.exists()
+        assert fresh.exists()
+
+    def test_sweep_without_folder(self, web_drafts_dir):
+        web_app._sweep_exports()  # Nothing exported yet: no error
+
+
+class TestValidateLengths:
+    """Tests for validate_lengths()."""
+
+    def test_none_when_all_within_limits(self):
+        assert validate_lengths(("abc", "A", 3), ("", "B", 0)) is None
+
+    def test_reports_first_oversized_field(self):
+        response = validate_lengths(("ok", "A", 5), ("toolong", "B", 3), ("toolong", "C", 3))
+        assert response.status_code == 400
+        assert b"B exceeds maximum length of 3" in response.body
+
+
+class TestBodySizeLimit:
+    """Tests for BodySizeLimitMiddleware with a stub downstream app."""
+
+    @staticmethod
+    def _call(content_length: int):
+        reached, sent = [], []
+
+        async def downstream(scope, receive, send):
+            reached.append(True)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "headers": [(b"content-length", str(content_length).encode())]}
+        asyncio.run(BodySizeLimitMiddleware(downstream)(scope, None, send))
+        return reached, sent
+
+    def test_passes_normal_request(self):
+        reached, sent = self._call(1024)
+        assert reached and not sent
+
+    def test_rejects_oversized_request(self):
+        reached, sent = self._call(MAX_BODY_BYTES + 1)
+        assert not reached
+        assert sent[0]["status"] == 413
+
+
+class TestCompression:
+    """Tests for CompressionMiddleware with a stub downstream app."""
+
+    @staticmethod
+    def _headers(path: str) -> dict:
+        async def downstream(scope, receive, send):
+            await send({
+                "type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"text/html")],
+            })
+            await send({"type": "http.response.body", "body": b"x" * 2000})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "path": path, "headers": [(b"accept-encoding", b"gzip")]}
+        asyncio.run(CompressionMiddleware(downstream)(scope, None, send))
+        return dict(sent[0]["headers"])
+
+    def test_fragments_gzipped(self):
+        assert self._headers("/drafts").get(b"content-encoding") == b"gzip"
+
+    def test_downloads_left_alone(self):
+        assert b"content-encoding" not in self._headers("/download/report.pdf")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Module: Plain-text line classification for AI Document Writer exports
+Version: 1.0.0
+Development Iteration: v1
+
+Project: AI Document Writer
+Developer: Kent Benson
+Created: 2026-10-15
+
+Enhancement: Shared single-pass classifier for the PDF and DOCX exporters
+
+Features:
+- ALL CAPS lines (4-79 chars) are section headings
+- Lines ending with ':' (under 60 chars) are sub-headings
+- '- ' / '* ' bullets and '1.' / '1)' numbered items
+- Everything else is a regular paragraph
+
+UV ENVIRONMENT: Run with `uv run python text_structure.py`
+"""
+
+import re
+
+HEADING = 1
+SUBHEADING = 2
+BULLET = 3
+NUMBERED = 4
+PARAGRAPH = 5
+
+NUMBERED_RE = re.compile(r'^\d+[\.\)]\s')
+
+
+def classify_line(stripped: str) -> int:
+    """
+    Classify a non-empty, stripped line in one pass.
+
+    Cheap length and first/last character gates run before the more expensive
+    isupper() scan and regex match. Precedence matches the original exporters:
+    heading, sub-heading, bullet, numbered, paragraph.
+    """
+    n = len(stripped)
+    if 3 < n < 80 and stripped.isupper():
+        return HEADING
+    if n < 60 and stripped[-1] == ':':
+        return SUBHEADING
+    first = stripped[0]
+    if first in '-*' and stripped[1:2] == ' ':
+        return BULLET
+    if first.isdigit() and NUMBERED_RE.match(stripped):
+        return NUMBERED
+    return PARAGRAPH
@@ -14,86 +14,159 @@ Enhancement: Security hardening (rate limiting, input validation, error handling
 Features:
 - FastAPI + Jinja2 + htmx web interface
 - Session-based password authentication with inactivity timeout
-- Generate and refine documents via Claude API
+- Generate and refine documents via Claude API (async client, no worker threads)
 - Save/load/delete drafts, export PDF and DOCX
 - 3-panel layout: templates | notes | document
-- Rate limiting on all POST/DELETE routes (10/min per IP)
-- Input length validation on all user-submitted fields
+- Per-IP rate limits on login and POST/DELETE routes, tighter on the paid API routes
+  (429 responses carry Retry-After; optional Redis storage)
+- Input length validation on all user-submitted fields (oversized bodies rejected unparsed)
+- Web exports kept in their own folder, removed once downloaded or after WEB_EXPORT_MAX_AGE
+- GZip compression for HTML fragments and static assets
+- Content-hashed static URLs served with immutable caching
+- Compiled Jinja2 templates cached on disk (no per-request reload check)
+- Index and login pages pre-rendered at startup
 
 UV ENVIRONMENT: Run with `uv run python web_app.py`
 
 INSTALLATION:
 uv add fastapi "uvicorn[standard]" jinja2 python-multipart slowapi
+uv add redis  # optional, for WEB_RATELIMIT_STORAGE=redis://...
 """
 
+import hashlib
 import hmac
 import logging
+import os
 import socket
+import stat
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
 
+import anyio.to_thread
+import jinja2
 import uvicorn
 from fastapi import FastAPI, Form, Request
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from starlette.background import BackgroundTask
 from starlette.middleware.sessions import SessionMiddleware
 
-from ai_writer import generate_draft, refine_text
-from config import DRAFTS_DIR, WEB_PASSWORD, WEB_PORT, WEB_SECRET_KEY, WEB_SESSION_TIMEOUT
+from ai_writer import generate_draft_async, prepare_client, refine_text_async
+from config import (
+    DRAFTS_DIR, WEB_EXPORT_MAX_AGE, WEB_PASSWORD, WEB_PORT, WEB_SECRET_KEY, WEB_SESSION_TIMEOUT, WEB_THREAD_LIMIT,
+    WEB_RATELIMIT_STORAGE, WEB_TRUSTED_PROXIES, WEB_WORKERS,
+)
 from draft_storage import delete_draft, list_drafts, load_draft, save_draft
 from export_docx import export_to_docx
 from export_pdf import export_to_pdf
-from templates import TEMPLATES, TONE_OPTIONS, get_template_by_name
+from templates import TEMPLATES, TEMPLATES_BY_NAME, TONE_OPTIONS
 
 # ── Logging ──────────────────────────────────────────────
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 # ── Rate Limiter ─────────────────────────────────────────
+# Keyed on the client address. Behind Cloudflare Tunnel that's cloudflared on
+# localhost; uvicorn's proxy-headers support replaces it with the X-Forwarded-For
+# client, but only for connections from WEB_TRUSTED_PROXIES, so other callers
+# can't pick their own rate-limit key by sending the header.
+
+# Moving window so a burst can't straddle two fixed windows; with Redis storage
+# the counters are shared by every worker, falling back to memory if it's down
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=WEB_RATELIMIT_STORAGE,
+    strategy="moving-window",
+    in_memory_fallback_enabled=True,
+)
 
-
-def _get_real_ip(request: Request) -> str:
-    """Get real client IP behind Cloudflare Tunnel (X-Forwarded-For)."""
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return get_remote_address(request)
+# ── App Setup ────────────────────────────────────────────
+BASE_DIR = Path(__file__).parent
 
 
-limiter = Limiter(key_func=_get_real_ip)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Draft storage and exports still block; size the shared anyio thread pool for them
+    anyio.to_thread.current_default_thread_limiter().total_tokens = WEB_THREAD_LIMIT
+    # Import the Anthropic SDK (~1s) now, off the event loop, not on the first request
+    await anyio.to_thread.run_sync(prepare_client)
+    await anyio.to_thread.run_sync(_sweep_exports)
+    yield
 
-# ── App Setup ────────────────────────────────────────────
-BASE_DIR = Path(__file__).parent
 
 app = FastAPI(
     title="AI Document Writer",
     docs_url=None,
     redoc_url=None,
     openapi_url=None,
+    lifespan=lifespan,
 )
 app.state.limiter = limiter
 app.add_middleware(SessionMiddleware, secret_key=WEB_SECRET_KEY)
-app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
 
-tpl = Jinja2Templates(directory=BASE_DIR / "templates")
 
-# Thread pool for blocking API calls
-_executor = ThreadPoolExecutor(max_workers=2)
+class VersionedStaticFiles(StaticFiles):
+    """StaticFiles that marks ?v=<hash> URLs (see static_url) as immutable."""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if scope["query_string"].startswith(b"v="):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+app.mount("/static", VersionedStaticFiles(directory=BASE_DIR / "static"), name="static")
+
+
+def static_url(path: str) -> str:
+    """URL for a file under static/, versioned by a hash of its contents."""
+    digest = hashlib.sha256((BASE_DIR / "static" / path).read_bytes()).hexdigest()[:8]
+    return f"/static/{path}?v={digest}"
+
+
+# Templates ship with the app, so skip the per-render mtime check (restart to
+# pick up edits) and keep compiled bytecode on disk across restarts
+tpl = Jinja2Templates(env=jinja2.Environment(
+    loader=jinja2.FileSystemLoader(BASE_DIR / "templates"),
+    autoescape=jinja2.select_autoescape(),
+    auto_reload=False,
+    bytecode_cache=jinja2.FileSystemBytecodeCache(),
+))
+tpl.env.globals["static_url"] = static_url
+
+# Full pages whose context never changes are rendered once at startup
+_INDEX_HTML = tpl.get_template("index.html").render(
+    templates=TEMPLATES,
+    tones=TONE_OPTIONS,
+    selected_template=TEMPLATES[0].name,
+).encode()
+_LOGIN_HTML = tpl.get_template("login.html").render(error=None).encode()
+_LOGIN_FAILED_HTML = tpl.get_template("login.html").render(error="Incorrect password").encode()
+
+# Compile the per-request fragments now so the first request doesn't pay for it
+for _fragment in ("document_result.html", "draft_list.html", "load_draft.html"):
+    tpl.get_template(f"fragments/{_fragment}")
 
 
 # ── Exception Handlers ───────────────────────────────────
 
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+    item, args = request.state.view_rate_limit
+    reset_at, _ = limiter.limiter.get_window_stats(item, *args)
     return JSONResponse(
         status_code=429,
         content={"detail": "Rate limit exceeded. Please try again later."},
+        headers={"Retry-After": str(max(1, int(reset_at - time.time()) + 1))},
     )
 
 
@@ -106,6 +179,26 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+# ── Static Fragments ─────────────────────────────────────
+# Fixed alert snippets, encoded once; each request still gets its own
+# HTMLResponse since middleware appends headers (e.g. Set-Cookie) to it
+
+def _alert(kind: str, message: str) -> bytes:
+    return f'<div class="alert alert-{kind}">{message}</div>'.encode()
+
+
+_ALERT_DRAFT_SAVED = _alert("success", "Draft saved.")
+_ALERT_SAVE_FAILED = _alert("error", "Failed to save draft.")
+_ALERT_DELETE_FAILED = _alert("error", "Could not delete draft.")
+_ALERT_LOAD_FAILED = _alert("error", "Could not load draft.")
+_ALERT_NO_EXPORT_TEXT = _alert("error", "No text to export.")
+_ALERT_PDF_FAILED = _alert("error", "PDF export failed.")
+_ALERT_DOCX_FAILED = _alert("error", "DOCX export failed.")
+_ALERT_FILE_NOT_FOUND = _alert("error", "File not found.")
+_ALERT_TOO_LARGE = _alert("error", "Request is too large.")
+_ALERT_UNKNOWN_TEMPLATE = _alert("error", "Unknown template.")
+
+
 # ── Input Validation ─────────────────────────────────────
 
 def validate_length(value: str, field_name: str, max_len: int) -> Optional[HTMLResponse]:
@@ -118,8 +211,64 @@ def validate_length(value: str, field_name: str, max_len: int) -> Optional[HTMLR
     return None
 
 
+def validate_lengths(*fields: tuple[str, str, int]) -> Optional[HTMLResponse]:
+    """validate_length() over (value, field_name, max_len) tuples; stops at the first error."""
+    for value, field_name, max_len in fields:
+        if len(value) > max_len:
+            return validate_length(value, field_name, max_len)
+    return None
+
+
+# Largest form is /save (~20k characters); percent-encoded UTF-8 can take up
+# to 12 bytes per character, so anything beyond this fails validation anyway
+MAX_BODY_BYTES = 256 * 1024
+
+
+class BodySizeLimitMiddleware:
+    """Reject requests whose Content-Length exceeds MAX_BODY_BYTES before the form is parsed."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > MAX_BODY_BYTES:
+                        response = HTMLResponse(_ALERT_TOO_LARGE, status_code=413)
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(BodySizeLimitMiddleware)
+
+
+class CompressionMiddleware:
+    """GZip responses over 500 bytes, except /download (PDF/DOCX are already compressed)."""
+
+    def __init__(self, app):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=500, compresslevel=5)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/download/"):
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+
+app.add_middleware(CompressionMiddleware)
+
+
 # ── Auth Helpers ─────────────────────────────────────────
 
+# Fixed for the life of the process (WEB_PASSWORD is read once from .env)
+_AUTH_REQUIRED = bool(WEB_PASSWORD)
+_LOGIN_URL = "/login"
+
+
 def is_logged_in(request: Request) -> bool:
     """Check if session is authenticated."""
     return request.session.get("authenticated") is True
@@ -127,18 +276,21 @@ def is_logged_in(request: Request) -> bool:
 
 def require_auth(request: Request) -> Optional[RedirectResponse]:
     """Return a redirect to /login if not authenticated or session expired, else None."""
-    if not WEB_PASSWORD:
+    if not _AUTH_REQUIRED:
         # No password configured — allow access
         return None
     if not is_logged_in(request):
-        return RedirectResponse(url="/login", status_code=303)
+        return RedirectResponse(url=_LOGIN_URL, status_code=303)
     # Check session timeout
-    last_active = request.session.get("last_active", 0)
-    if time.time() - last_active > WEB_SESSION_TIMEOUT:
+    now = time.time()
+    idle = now - request.session.get("last_active", 0)
+    if idle > WEB_SESSION_TIMEOUT:
         request.session.clear()
-        return RedirectResponse(url="/login", status_code=303)
-    # Sliding window — update timestamp on every authenticated request
-    request.session["last_active"] = time.time()
+        return RedirectResponse(url=_LOGIN_URL, status_code=303)
+    # Sliding window — writing the session makes SessionMiddleware re-sign the
+    # cookie, so only move the timestamp once it's a tenth of the timeout old
+    if idle > WEB_SESSION_TIMEOUT / 10:
+        request.session["last_active"] = now
     return None
 
 
@@ -153,24 +305,25 @@ async def health():
 
 @app.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
-    if not WEB_PASSWORD or is_logged_in(request):
+    if not _AUTH_REQUIRED or is_logged_in(request):
         return RedirectResponse(url="/", status_code=303)
-    return tpl.TemplateResponse("login.html", {"request": request, "error": None})
+    return HTMLResponse(_LOGIN_HTML)
 
 
 @app.post("/login", response_class=HTMLResponse)
+@limiter.limit("5/minute")
 async def login_submit(request: Request, password: str = Form(...)):
     if hmac.compare_digest(password, WEB_PASSWORD):
         request.session["authenticated"] = True
         request.session["last_active"] = time.time()
         return RedirectResponse(url="/", status_code=303)
-    return tpl.TemplateResponse("login.html", {"request": request, "error": "Incorrect password"})
+    return HTMLResponse(_LOGIN_FAILED_HTML)
 
 
 @app.get("/logout")
 async def logout(request: Request):
     request.session.clear()
-    return RedirectResponse(url="/login", status_code=303)
+    return RedirectResponse(url=_LOGIN_URL, status_code=303)
 
 
 # ── Routes: Main Page ────────────────────────────────────
@@ -180,18 +333,13 @@ async def index(request: Request):
     redirect = require_auth(request)
     if redirect:
         return redirect
-    return tpl.TemplateResponse("index.html", {
-        "request": request,
-        "templates": TEMPLATES,
-        "tones": TONE_OPTIONS,
-        "selected_template": TEMPLATES[0].name,
-    })
+    return HTMLResponse(_INDEX_HTML)
 
 
 # ── Routes: Generate & Refine ────────────────────────────
 
 @app.post("/generate", response_class=HTMLResponse)
-@limiter.limit("10/minute")
+@limiter.limit("3/minute;30/hour")
 async def generate(
     request: Request,
     template_name: str = Form(...),
@@ -202,19 +350,18 @@ async def generate(
     if redirect:
         return redirect
 
-    for err in [
-        validate_length(template_name, "Template name", 200),
-        validate_length(notes, "Notes", 10_000),
-        validate_length(tone, "Tone", 200),
-    ]:
-        if err:
-            return err
+    template = TEMPLATES_BY_NAME.get(template_name)
+    if template is None:
+        return HTMLResponse(_ALERT_UNKNOWN_TEMPLATE, status_code=400)
 
-    template = get_template_by_name(template_name)
+    err = validate_lengths(
+        (notes, "Notes", 10_000),
+        (tone, "Tone", 200),
+    )
+    if err:
+        return err
 
-    import asyncio
-    loop = asyncio.get_event_loop()
-    text = await loop.run_in_executor(_executor, generate_draft, template, notes, tone)
+    text = await generate_draft_async(template, notes, tone)
 
     return tpl.TemplateResponse("fragments/document_result.html", {
         "request": request,
@@ -224,7 +371,7 @@ async def generate(
 
 
 @app.post("/refine", response_class=HTMLResponse)
-@limiter.limit("10/minute")
+@limiter.limit("5/minute;60/hour")
 async def refine(
     request: Request,
     current_text: str = Form(...),
@@ -235,17 +382,15 @@ async def refine(
     if redirect:
         return redirect
 
-    for err in [
-        validate_length(current_text, "Document text", 10_000),
-        validate_length(instruction, "Instruction", 2_000),
-        validate_length(template_name, "Template name", 200),
-    ]:
-        if err:
-            return err
+    err = validate_lengths(
+        (current_text, "Document text", 10_000),
+        (instruction, "Instruction", 2_000),
+        (template_name, "Template name", 200),
+    )
+    if err:
+        return err
 
-    import asyncio
-    loop = asyncio.get_event_loop()
-    text = await loop.run_in_executor(_executor, refine_text, current_text, instruction, template_name)
+    text = await refine_text_async(current_text, instruction, template_name)
 
     return tpl.TemplateResponse("fragments/document_result.html", {
         "request": request,
@@ -257,7 +402,7 @@ async def refine(
 # ── Routes: Drafts ───────────────────────────────────────
 
 @app.post("/save", response_class=HTMLResponse)
-@limiter.limit("10/minute")
+@limiter.limit("20/minute")
 async def save(
     request: Request,
     title: str = Form(...),
@@ -270,20 +415,20 @@ async def save(
     if redirect:
         return redirect
 
-    for err in [
-        validate_length(title, "Title", 200),
-        validate_length(template_name, "Template name", 200),
-        validate_length(tone, "Tone", 200),
-        validate_length(notes, "Notes", 10_000),
-        validate_length(document_text, "Document text", 10_000),
-    ]:
-        if err:
-            return err
-
-    filepath = save_draft(title, template_name, tone, notes, document_text)
+    err = validate_lengths(
+        (title, "Title", 200),
+        (template_name, "Template name", 200),
+        (tone, "Tone", 200),
+        (notes, "Notes", 10_000),
+        (document_text, "Document text", 10_000),
+    )
+    if err:
+        return err
+
+    filepath = await anyio.to_thread.run_sync(save_draft, title, template_name, tone, notes, document_text)
     if filepath:
-        return HTMLResponse('<div class="alert alert-success">Draft saved.</div>')
-    return HTMLResponse('<div class="alert alert-error">Failed to save draft.</div>')
+        return HTMLResponse(_ALERT_DRAFT_SAVED)
+    return HTMLResponse(_ALERT_SAVE_FAILED)
 
 
 @app.get("/drafts", response_class=HTMLResponse)
@@ -292,7 +437,7 @@ async def drafts(request: Request):
     if redirect:
         return redirect
 
-    all_drafts = list_drafts()
+    all_drafts = await anyio.to_thread.run_sync(list_drafts)
     return tpl.TemplateResponse("fragments/draft_list.html", {
         "request": request,
         "drafts": all_drafts,
@@ -300,16 +445,16 @@ async def drafts(request: Request):
 
 
 @app.delete("/drafts/{filename}", response_class=HTMLResponse)
-@limiter.limit("10/minute")
+@limiter.limit("20/minute")
 async def delete_draft_route(request: Request, filename: str):
     redirect = require_auth(request)
     if redirect:
         return redirect
 
-    if not delete_draft(filename):
-        return HTMLResponse('<div class="alert alert-error">Could not delete draft.</div>', status_code=400)
+    if not await anyio.to_thread.run_sync(delete_draft, filename):
+        return HTMLResponse(_ALERT_DELETE_FAILED, status_code=400)
 
-    all_drafts = list_drafts()
+    all_drafts = await anyio.to_thread.run_sync(list_drafts)
     return tpl.TemplateResponse("fragments/draft_list.html", {
         "request": request,
         "drafts": all_drafts,
@@ -322,36 +467,20 @@ async def load(request: Request, filepath: str = Form(...)):
     if redirect:
         return redirect
 
-    draft = load_draft(filepath)
+    draft = await anyio.to_thread.run_sync(load_draft, filepath)
     if not draft:
-        return HTMLResponse('<div class="alert alert-error">Could not load draft.</div>')
+        return HTMLResponse(_ALERT_LOAD_FAILED)
 
     # Return the document text plus a script that restores the full state
-    html = (
-        f'<textarea id="document-text" oninput="updateWordCount()">{draft.document_text}</textarea>\n'
-        f'<script>\n'
-        f'loadDraftState({{\n'
-        f'  template_name: "{draft.template_name}",\n'
-        f'  tone: "{draft.tone}",\n'
-        f'  notes: {_js_string(draft.notes)}\n'
-        f'}});\n'
-        f'</script>'
-    )
-    return HTMLResponse(html)
-
-
-def _js_string(s: str) -> str:
-    """Escape a Python string for safe embedding in a JS string literal."""
-    escaped = (
-        s.replace("\\", "\\\\")
-        .replace('"', '\\"')
-        .replace("'", "\\'")
-        .replace("\n", "\\n")
-        .replace("\r", "\\r")
-        .replace("<", "\\x3c")
-        .replace(">", "\\x3e")
-    )
-    return f'"{escaped}"'
+    return tpl.TemplateResponse("fragments/load_draft.html", {
+        "request": request,
+        "document_text": draft.document_text,
+        "state": {
+            "template_name": draft.template_name,
+            "tone": draft.tone,
+            "notes": draft.notes,
+        },
+    })
 
 
 # ── Routes: Export ───────────────────────────────────────
@@ -359,8 +488,70 @@ def _js_string(s: str) -> str:
 # Browsers block file downloads from POST on insecure (HTTP) origins,
 # but allow them from GET requests.
 
+# Web exports go to their own subfolder of the drafts folder (desktop exports
+# stay in the drafts folder itself). Each session's exports are listed in the
+# session (shared by all workers) and deleted once downloaded; anything never
+# downloaded is swept after WEB_EXPORT_MAX_AGE, at startup and on each export.
+_EXPORTS_KEY = "exports"
+_EXPORTS_DIRNAME = "Web Exports"
+
+
+def _exports_dir() -> Path:
+    """Folder for web exports (follows DRAFTS_DIR)."""
+    return DRAFTS_DIR / _EXPORTS_DIRNAME
+
+
+def _sweep_exports() -> None:
+    """Delete web exports older than WEB_EXPORT_MAX_AGE."""
+    cutoff = time.time() - WEB_EXPORT_MAX_AGE
+    try:
+        with os.scandir(_exports_dir()) as entries:
+            for entry in entries:
+                try:
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass  # Downloaded or swept by another worker meanwhile
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to sweep web exports: {e}")
+
+
+def _export(export_fn, text: str, title: str) -> Optional[str]:
+    """Sweep stale exports, then run export_fn into the web exports folder (blocking)."""
+    _sweep_exports()
+    return export_fn(text, title, output_dir=_exports_dir())
+
+
+_MEDIA_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+class _ExportFileResponse(FileResponse):
+    """FileResponse read in 1 MiB chunks: uvicorn has no sendfile/pathsend support,
+    so each chunk is a thread-pool read plus a send, and exports are rarely larger."""
+    chunk_size = 1024 * 1024
+
+
+def _remember_export(request: Request, filename: str) -> None:
+    """Record an export for this session (last 10 kept to bound the cookie)."""
+    request.session[_EXPORTS_KEY] = request.session.get(_EXPORTS_KEY, [])[-9:] + [filename]
+
+
+def _claim_export(request: Request, filename: str) -> bool:
+    """Forget filename if this session exported it; True if it did."""
+    exports = request.session.get(_EXPORTS_KEY, [])
+    if filename not in exports:
+        return False
+    exports.remove(filename)
+    request.session[_EXPORTS_KEY] = exports
+    return True
+
 @app.post("/export/pdf")
-@limiter.limit("10/minute")
+@limiter.limit("20/minute")
 async def export_pdf_route(
     request: Request,
     text: str = Form(...),
@@ -370,26 +561,27 @@ async def export_pdf_route(
     if redirect:
         return redirect
 
-    for err in [
-        validate_length(text, "Document text", 10_000),
-        validate_length(title, "Title", 200),
-    ]:
-        if err:
-            return err
+    err = validate_lengths(
+        (text, "Document text", 10_000),
+        (title, "Title", 200),
+    )
+    if err:
+        return err
 
-    if not text.strip():
-        return HTMLResponse('<div class="alert alert-error">No text to export.</div>')
+    if not text or text.isspace():
+        return HTMLResponse(_ALERT_NO_EXPORT_TEXT)
 
-    filepath = export_to_pdf(text, title)
+    filepath = await anyio.to_thread.run_sync(_export, export_to_pdf, text, title)
     if not filepath:
-        return HTMLResponse('<div class="alert alert-error">PDF export failed.</div>')
+        return HTMLResponse(_ALERT_PDF_FAILED)
 
     filename = Path(filepath).name
+    _remember_export(request, filename)
     return RedirectResponse(url=f"/download/{filename}", status_code=303)
 
 
 @app.post("/export/docx")
-@limiter.limit("10/minute")
+@limiter.limit("20/minute")
 async def export_docx_route(
     request: Request,
     text: str = Form(...),
@@ -399,21 +591,22 @@ async def export_docx_route(
     if redirect:
         return redirect
 
-    for err in [
-        validate_length(text, "Document text", 10_000),
-        validate_length(title, "Title", 200),
-    ]:
-        if err:
-            return err
+    err = validate_lengths(
+        (text, "Document text", 10_000),
+        (title, "Title", 200),
+    )
+    if err:
+        return err
 
-    if not text.strip():
-        return HTMLResponse('<div class="alert alert-error">No text to export.</div>')
+    if not text or text.isspace():
+        return HTMLResponse(_ALERT_NO_EXPORT_TEXT)
 
-    filepath = export_to_docx(text, title)
+    filepath = await anyio.to_thread.run_sync(_export, export_to_docx, text, title)
     if not filepath:
-        return HTMLResponse('<div class="alert alert-error">DOCX export failed.</div>')
+        return HTMLResponse(_ALERT_DOCX_FAILED)
 
     filename = Path(filepath).name
+    _remember_export(request, filename)
     return RedirectResponse(url=f"/download/{filename}", status_code=303)
 
 
@@ -423,21 +616,28 @@ async def download_file(request: Request, filename: str):
     if redirect:
         return redirect
 
-    # Only serve files from the drafts directory (prevent path traversal)
+    # Only serve files from the web exports folder (prevent path traversal)
     safe_name = Path(filename).name
-    filepath = DRAFTS_DIR / safe_name
-    if not filepath.exists():
-        return HTMLResponse('<div class="alert alert-error">File not found.</div>', status_code=404)
-
-    suffix = filepath.suffix.lower()
-    if suffix == ".pdf":
-        media_type = "application/pdf"
-    elif suffix == ".docx":
-        media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    else:
-        media_type = "application/octet-stream"
-
-    return FileResponse(filepath, media_type=media_type, filename=safe_name)
+    filepath = _exports_dir() / safe_name
+    try:
+        # lstat so a symlink planted in the exports folder is refused, not followed;
+        # the result is handed to FileResponse so it doesn't stat again
+        stat_result = os.lstat(filepath)
+    except OSError:
+        return HTMLResponse(_ALERT_FILE_NOT_FOUND, status_code=404)
+    if not stat.S_ISREG(stat_result.st_mode):
+        return HTMLResponse(_ALERT_FILE_NOT_FOUND, status_code=404)
+
+    media_type = _MEDIA_TYPES.get(filepath.suffix.lower(), "application/octet-stream")
+
+    background = None
+    if _claim_export(request, safe_name):
+        background = BackgroundTask(filepath.unlink, missing_ok=True)
+
+    return _ExportFileResponse(
+        filepath, media_type=media_type, filename=safe_name,
+        stat_result=stat_result, background=background,
+    )
 
 
 # ── Adaptive Port Detection ─────────────────────────────
@@ -452,62 +652,101 @@ def get_local_ip() -> str:
         return "127.0.0.1"
 
 
-def get_external_ip() -> Optional[str]:
-    """Get public IP — checks GCP metadata first, then a public service."""
+def _gcp_external_ip() -> Optional[str]:
+    """Public IP from the GCP metadata server (instant on GCP, times out elsewhere)."""
     import urllib.request
 
-    # Try GCP metadata (instant, no external network call)
+    req = urllib.request.Request(
+        "http://metadata.google.internal/computeMetadata/v1/instance/"
+        "network-interfaces/0/access-configs/0/external-ip",
+        headers={"Metadata-Flavor": "Google"},
+    )
+    with urllib.request.urlopen(req, timeout=2) as resp:
+        return resp.read().decode().strip()
+
+
+def _ipify_external_ip() -> Optional[str]:
+    """Public IP from a public lookup service."""
+    import urllib.request
+
+    with urllib.request.urlopen("https://api.ipify.org", timeout=3) as resp:
+        return resp.read().decode().strip()
+
+
+def get_external_ip() -> Optional[str]:
+    """Get public IP — queries GCP metadata and a public service at once, first answer wins."""
+    # Off GCP the metadata lookup only ever times out, so don't make ipify wait for it
+    executor = ThreadPoolExecutor(max_workers=2)
+    futures = [executor.submit(_gcp_external_ip), executor.submit(_ipify_external_ip)]
     try:
-        req = urllib.request.Request(
-            "http://metadata.google.internal/computeMetadata/v1/instance/"
-            "network-interfaces/0/access-configs/0/external-ip",
-            headers={"Metadata-Flavor": "Google"},
-        )
-        with urllib.request.urlopen(req, timeout=2) as resp:
-            ip = resp.read().decode().strip()
+        for future in as_completed(futures):
+            try:
+                ip = future.result()
+            except Exception:
+                continue
             if ip:
                 return ip
-    except Exception:
-        pass
-
-    # Fallback: public IP service
-    try:
-        with urllib.request.urlopen("https://api.ipify.org", timeout=3) as resp:
-            return resp.read().decode().strip()
-    except Exception:
         return None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _log_public_url(port: int) -> None:
+    """Log the public URL once the external IP is known (run on a background thread)."""
+    external_ip = get_external_ip()
+    if external_ip:
+        logger.info(f"  Public:  http://{external_ip}:{port}")
 
 
-def find_available_port(start_port: int = 8090, max_attempts: int = 100) -> int:
-    """Find an available port starting from start_port."""
+def bind_available_port(start_port: int = 8090, max_attempts: int = 100) -> socket.socket:
+    """
+    Bind the server socket to the first free port from start_port.
+
+    The bound socket is handed to uvicorn as-is, so no other process can take
+    the port between choosing it and serving on it.
+    """
+    # A failed bind leaves the socket unbound, so one socket serves every attempt
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    # Same as uvicorn's own socket: a port still in TIME_WAIT from a previous run is reusable
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     for port in range(start_port, start_port + max_attempts):
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(("127.0.0.1", port))
-                return port
+            s.bind(("0.0.0.0", port))
+            return s
         except OSError:
             continue
+    s.close()
     raise RuntimeError(f"No available ports in range {start_port}-{start_port + max_attempts}")
 
 
 # ── Entry Point ──────────────────────────────────────────
 
 if __name__ == "__main__":
-    port = find_available_port(WEB_PORT)
+    server_socket = bind_available_port(WEB_PORT)
+    port = server_socket.getsockname()[1]
     if port != WEB_PORT:
         logger.info(f"Port {WEB_PORT} in use, using port {port} instead")
 
     local_ip = get_local_ip()
-    external_ip = get_external_ip()
     logger.info(f"Starting AI Document Writer")
     logger.info(f"  Local:   http://127.0.0.1:{port}")
     logger.info(f"  LAN:     http://{local_ip}:{port}")
-    if external_ip:
-        logger.info(f"  Public:  http://{external_ip}:{port}")
+    # The public IP lookup can take seconds offline; log it whenever it arrives
+    threading.Thread(target=_log_public_url, args=(port,), name="public-ip", daemon=True).start()
     if WEB_PASSWORD:
         logger.info("Password authentication enabled")
     else:
         logger.info("No WEB_PASSWORD set — access is open (set WEB_PASSWORD in .env to enable auth)")
     logger.info(f"Session timeout: {WEB_SESSION_TIMEOUT}s")
 
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    if WEB_WORKERS > 1:
+        # Each worker process re-imports the app, so uvicorn needs an import string
+        logger.info(f"Workers: {WEB_WORKERS}")
+        if WEB_RATELIMIT_STORAGE.startswith("memory://"):
+            logger.warning("Rate limits are counted per worker (set WEB_RATELIMIT_STORAGE to share them)")
+        uvicorn.run(
+            "web_app:app", fd=server_socket.fileno(), workers=WEB_WORKERS, app_dir=str(BASE_DIR),
+            forwarded_allow_ips=WEB_TRUSTED_PROXIES,
+        )
+    else:
+        uvicorn.run(app, fd=server_socket.fileno(), forwarded_allow_ips=WEB_TRUSTED_PROXIES)